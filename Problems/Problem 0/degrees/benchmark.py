@@ -0,0 +1,203 @@
+"""
+Benchmark for degrees.py on synthetic scale-free datasets
+
+Usage: python benchmark.py edges [queries]
+
+Generates people.csv, movies.csv and stars.csv with about the given
+number of star edges under synthetic/<edges> (reusing them if they
+already exist), then reports load time, memory allocated loading from
+CSV, loading from the snapshot and after a query workload, and query
+latency percentiles and people expanded for random pairs of people, with
+and without a landmark index.
+"""
+
+import csv
+import itertools
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import degrees
+from landmarks import landmark_shortest_path
+from snapshot import SNAPSHOT_NAME
+
+# Roughly three star edges per person, as in the IMDB data
+EDGES_PER_PERSON = 3
+
+# Shape of the power laws for cast sizes and for how often people are cast
+CAST_SHAPE = 1.5
+POPULARITY_EXPONENT = 0.8
+MAX_CAST = 500
+
+# Landmark index kept next to the generated data
+LANDMARKS_NAME = "landmarks.csv"
+
+
+def generate(directory, edges, seed=0):
+    """
+    Writes a synthetic dataset with about the given number of star edges.
+
+    Cast sizes follow a Pareto distribution and people are cast with
+    Zipf-like popularity, giving a scale-free person <-> movie graph.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    people_count = max(2, edges // EDGES_PER_PERSON)
+
+    with open(os.path.join(directory, "people.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for i in range(people_count):
+            writer.writerow([i, f"Person {i}", rng.randint(1900, 2010)])
+
+    # Cumulative popularity weights for picking cast members
+    popularity = itertools.accumulate(
+        1 / (rank + 1) ** POPULARITY_EXPONENT for rank in range(people_count)
+    )
+    cum_weights = list(popularity)
+    population = range(people_count)
+
+    with open(os.path.join(directory, "movies.csv"), "w", encoding="utf-8", newline="") as movies_file, \
+            open(os.path.join(directory, "stars.csv"), "w", encoding="utf-8", newline="") as stars_file:
+        movies_writer = csv.writer(movies_file)
+        stars_writer = csv.writer(stars_file)
+        movies_writer.writerow(["id", "title", "year"])
+        stars_writer.writerow(["person_id", "movie_id"])
+
+        written = 0
+        movie_id = 0
+        while written < edges:
+            cast_size = min(int(rng.paretovariate(CAST_SHAPE)), MAX_CAST, edges - written)
+            movies_writer.writerow([movie_id, f"Movie {movie_id}", rng.randint(1920, 2020)])
+            for person_id in rng.choices(population, cum_weights=cum_weights, k=cast_size):
+                stars_writer.writerow([person_id, movie_id])
+            written += cast_size
+            movie_id += 1
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """
+    Returns the nearest-rank percentiles of the samples.
+    """
+    ordered = sorted(samples)
+    return {
+        point: ordered[max(0, math.ceil(point / 100 * len(ordered)) - 1)]
+        for point in points
+    }
+
+
+def clear_data():
+    """
+    Empties the data loaded into degrees.
+    """
+    degrees.names.clear()
+    degrees.people.clear()
+    degrees.movies.clear()
+
+
+def time_load(directory, use_snapshot):
+    """
+    Returns the seconds taken to load the directory into degrees.
+    """
+    clear_data()
+    start = time.perf_counter()
+    degrees.load_data(directory, use_snapshot=use_snapshot)
+    return time.perf_counter() - start
+
+
+def traced_memory(directory, use_snapshot, pairs=()):
+    """
+    Returns the bytes still allocated after loading the directory and
+    answering cached_shortest_path for every pair, and the peak bytes
+    allocated on the way.
+
+    Snapshot pages mapped from disk are not allocations, so they are
+    not counted.
+    """
+    clear_data()
+    tracemalloc.start()
+    degrees.load_data(directory, use_snapshot=use_snapshot)
+    for source, target in pairs:
+        degrees.cached_shortest_path(source, target)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak
+
+
+def time_queries(search, pairs):
+    """
+    Returns the seconds taken by the search for every pair
+    and the total number of people it expanded.
+    """
+    latencies = []
+    expanded = 0
+    for source, target in pairs:
+        stats = {}
+        start = time.perf_counter()
+        search(source, target, stats=stats)
+        latencies.append(time.perf_counter() - start)
+        expanded += stats["people_expanded"]
+    return latencies, expanded
+
+
+def report_queries(label, search, pairs):
+    """
+    Prints the latency percentiles and people expanded by the search.
+    """
+    latencies, expanded = time_queries(search, pairs)
+    summary = ", ".join(f"p{point} {seconds * 1000:.2f}ms" for point, seconds in percentiles(latencies).items())
+    print(f"{label}: {summary}, total {sum(latencies):.2f}s, {expanded} people expanded")
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python benchmark.py edges [queries]")
+    edges = int(float(sys.argv[1]))
+    queries = int(sys.argv[2]) if len(sys.argv) == 3 else 100
+
+    directory = os.path.join("synthetic", str(edges))
+    if not os.path.exists(os.path.join(directory, "stars.csv")):
+        print(f"Generating {edges} edges in {directory}...")
+        generate(directory, edges)
+
+    _, peak = traced_memory(directory, use_snapshot=False)
+    print(f"CSV load memory: peak {peak / 2 ** 20:.1f} MiB")
+    print(f"CSV load: {time_load(directory, use_snapshot=False):.3f}s")
+
+    # Time a cold build of the snapshot before timing loads from it
+    snapshot = os.path.join(directory, SNAPSHOT_NAME)
+    if os.path.exists(snapshot):
+        os.remove(snapshot)
+    print(f"Snapshot build: {time_load(directory, use_snapshot=True):.3f}s")
+    print(f"Snapshot load: {time_load(directory, use_snapshot=True):.3f}s")
+    _, peak = traced_memory(directory, use_snapshot=True)
+    mapped = os.path.getsize(snapshot)
+    print(f"Snapshot load memory: peak {peak / 2 ** 20:.1f} MiB, {mapped / 2 ** 20:.1f} MiB mapped")
+
+    # Query random pairs of people who starred in at least one movie
+    rng = random.Random(1)
+    cast = [person_id for person_id in degrees.people if degrees.people[person_id]["movies"]]
+    pairs = [(rng.choice(cast), rng.choice(cast)) for _ in range(queries)]
+    report_queries("BFS", degrees.shortest_path, pairs)
+    report_queries("Bidirectional BFS", degrees.bidirectional_shortest_path, pairs)
+
+    # Memory left allocated by the records, parents and cached paths of a workload
+    current, peak = traced_memory(directory, use_snapshot=True, pairs=pairs)
+    print(f"Memory after {queries} queries: {current / 2 ** 20:.1f} MiB, peak {peak / 2 ** 20:.1f} MiB")
+
+    # Build the landmark index once, or reuse it if it matches the data
+    start = time.perf_counter()
+    index = degrees.load_landmarks(os.path.join(directory, LANDMARKS_NAME))
+    print(f"Landmark index: {time.perf_counter() - start:.3f}s")
+
+    def landmark_search(source, target, stats=None):
+        return landmark_shortest_path(degrees.people, degrees.movies, index, source, target, stats)
+
+    report_queries("Landmark A*", landmark_search, pairs)
+
+
+if __name__ == "__main__":
+    main()
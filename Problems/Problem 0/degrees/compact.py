@@ -0,0 +1,404 @@
+"""
+Compact integer-indexed graph for the degrees dataset
+"""
+
+import bisect
+import csv
+from array import array
+from abc import abstractmethod
+from collections.abc import MutableMapping
+
+
+class CompactGraph():
+    """
+    Bipartite person <-> movie graph in compressed sparse row form.
+
+    People and movies are interned to dense integers. The movies of
+    person i are person_movies[person_offsets[i]:person_offsets[i + 1]]
+    and the stars of movie j are movie_stars[movie_offsets[j]:movie_offsets[j + 1]].
+    """
+
+    def __init__(self, person_ids, names, births, movie_ids, titles, years,
+                 person_offsets, person_movies, movie_offsets, movie_stars,
+                 name_keys=None, name_people=None):
+        self.person_ids = person_ids
+        self.names = names
+        self.births = births
+        self.movie_ids = movie_ids
+        self.titles = titles
+        self.years = years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+
+        # Map IMDB ids back to their dense integers
+        self.person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        self.movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+        # Lowercase names in sorted order, with the person integer for each
+        if name_keys is None:
+            lowered = [name.lower() for name in names]
+            name_people = array("i", sorted(range(len(names)), key=lowered.__getitem__))
+            name_keys = [lowered[person] for person in name_people]
+        self.name_keys = name_keys
+        self.name_people = name_people
+
+    def name_range(self, key):
+        """
+        Returns the positions in name_keys holding the lowercase name.
+        """
+        start = bisect.bisect_left(self.name_keys, key)
+        end = start
+        while end < len(self.name_keys) and self.name_keys[end] == key:
+            end += 1
+        return range(start, end)
+
+    def movies_for(self, person):
+        """
+        Returns the movie integers a person integer starred in.
+        """
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_for(self, movie):
+        """
+        Returns the person integers that starred in a movie integer.
+        """
+        return self.movie_stars[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        neighbors = set()
+        for movie in self.movies_for(self.person_index[person_id]):
+            movie_id = self.movie_ids[movie]
+            for person in self.stars_for(movie):
+                neighbors.add((movie_id, self.person_ids[person]))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+        """
+        source = self.person_index[source]
+        target = self.person_index[target]
+        if source == target:
+            return []
+
+        # Search breadth-first from both ends, growing the smaller frontier
+        forward_parents = {source: None}
+        backward_parents = {target: None}
+        forward_frontier = [source]
+        backward_frontier = [target]
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = self.expand_level(
+                    forward_frontier, forward_parents, backward_parents
+                )
+            else:
+                backward_frontier, meeting = self.expand_level(
+                    backward_frontier, backward_parents, forward_parents
+                )
+            if meeting is not None:
+                return self.join_paths(meeting, forward_parents, backward_parents)
+
+        return None
+
+    def expand_level(self, frontier, parents, other_parents):
+        """
+        Expands every person in the frontier by one degree.
+
+        Returns the next frontier and the first person that has also been
+        reached by the other search, or None if the searches have not met.
+        """
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+
+        next_frontier = []
+        for person in frontier:
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    state = movie_stars[j]
+                    if state in parents:
+                        continue
+                    parents[state] = (movie, person)
+                    if state in other_parents:
+                        return next_frontier, state
+                    next_frontier.append(state)
+        return next_frontier, None
+
+    def join_paths(self, meeting, forward_parents, backward_parents):
+        """
+        Returns the (movie_id, person_id) path through the meeting person,
+        translated back to IMDB ids.
+        """
+        path = []
+        state = meeting
+        while forward_parents[state] is not None:
+            movie, parent = forward_parents[state]
+            path.append((self.movie_ids[movie], self.person_ids[state]))
+            state = parent
+        path.reverse()
+
+        state = meeting
+        while backward_parents[state] is not None:
+            movie, child = backward_parents[state]
+            path.append((self.movie_ids[movie], self.person_ids[child]))
+            state = child
+
+        return path
+
+
+def build_csr(count, sources, destinations):
+    """
+    Groups the (source, destination) edges by source.
+
+    Returns the offsets array of length count + 1 and the
+    destinations array ordered by source.
+    """
+
+    # Count the edges leaving every source
+    offsets = array("i", bytes(4 * (count + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+
+    # Turn the counts into starting positions
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    # Place every destination into its source's slot
+    edges = array("i", bytes(4 * len(sources)))
+    position = array("i", offsets[:count])
+    for source, destination in zip(sources, destinations):
+        edges[position[source]] = destination
+        position[source] += 1
+
+    return offsets, edges
+
+
+def load_compact(directory):
+    """
+    Load data from CSV files into a CompactGraph.
+    """
+    person_ids, names, births = [], [], []
+    person_index = {}
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            person_index[row["id"]] = len(person_ids)
+            person_ids.append(row["id"])
+            names.append(row["name"])
+            births.append(row["birth"])
+
+    movie_ids, titles, years = [], [], []
+    movie_index = {}
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            movie_index[row["id"]] = len(movie_ids)
+            movie_ids.append(row["id"])
+            titles.append(row["title"])
+            years.append(row["year"])
+
+    # Collect the star edges, skipping rows that refer to unknown ids
+    edge_people = array("i")
+    edge_movies = array("i")
+    seen = set()
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            person = person_index.get(row["person_id"])
+            movie = movie_index.get(row["movie_id"])
+            if person is None or movie is None:
+                continue
+            key = person * len(movie_ids) + movie
+            if key in seen:
+                continue
+            seen.add(key)
+            edge_people.append(person)
+            edge_movies.append(movie)
+
+    person_offsets, person_movies = build_csr(len(person_ids), edge_people, edge_movies)
+    movie_offsets, movie_stars = build_csr(len(movie_ids), edge_movies, edge_people)
+
+    return CompactGraph(
+        person_ids, names, births, movie_ids, titles, years,
+        person_offsets, person_movies, movie_offsets, movie_stars
+    )
+
+
+class GraphRecords(MutableMapping):
+    """
+    Mapping over the records of a CompactGraph, standing in for a
+    dictionary of them.
+
+    A record is built from the graph every time its key is looked up and
+    is not kept, so sweeping the graph builds nothing that lasts. Keys
+    can be added and removed without changing the graph, and records
+    that must be changed in place are taken with editable, which keeps
+    them from then on.
+    """
+
+    def __init__(self):
+        self.graph = None
+        self.records = {}
+        self.removed = set()
+        self.added = set()
+        self.graph_count = 0
+
+    def attach(self, graph):
+        """
+        Replaces the contents of the mapping with the records of the graph.
+        """
+        self.graph = graph
+        self.records = {}
+        self.removed = set()
+        self.added = set()
+        self.graph_count = 0 if graph is None else self.count_graph_keys()
+
+    def clear(self):
+        self.attach(None)
+
+    @abstractmethod
+    def in_graph(self, key):
+        """
+        Returns True if the graph holds a record for the key.
+        """
+
+    @abstractmethod
+    def graph_keys(self):
+        """
+        Returns an iterable over the keys of the records in the graph.
+        """
+
+    @abstractmethod
+    def graph_record(self, key):
+        """
+        Returns a new record for a key in the graph.
+        """
+
+    def count_graph_keys(self):
+        """
+        Returns the number of keys in the graph.
+        """
+        return sum(1 for _ in self.graph_keys())
+
+    def editable(self, key):
+        """
+        Returns the record for the key, kept so that changes made to it last.
+        """
+        if key not in self.records:
+            self.records[key] = self[key]
+        return self.records[key]
+
+    def __getitem__(self, key):
+        try:
+            return self.records[key]
+        except KeyError:
+            pass
+        if self.graph is None or key in self.removed or not self.in_graph(key):
+            raise KeyError(key)
+        return self.graph_record(key)
+
+    def __setitem__(self, key, value):
+        self.records[key] = value
+        if self.graph is not None and self.in_graph(key):
+            self.removed.discard(key)
+        else:
+            self.added.add(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.records.pop(key, None)
+        self.added.discard(key)
+        if self.graph is not None and self.in_graph(key):
+            self.removed.add(key)
+
+    def __contains__(self, key):
+        if key in self.records:
+            return True
+        return self.graph is not None and key not in self.removed and self.in_graph(key)
+
+    def __iter__(self):
+        if self.graph is not None:
+            for key in self.graph_keys():
+                if key not in self.removed:
+                    yield key
+        yield from list(self.added)
+
+    def __len__(self):
+        return self.graph_count - len(self.removed) + len(self.added)
+
+
+class PersonRecords(GraphRecords):
+    """
+    Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids).
+    """
+
+    def in_graph(self, key):
+        return key in self.graph.person_index
+
+    def count_graph_keys(self):
+        return len(self.graph.person_ids)
+
+    def graph_keys(self):
+        return self.graph.person_ids
+
+    def graph_record(self, key):
+        graph = self.graph
+        person = graph.person_index[key]
+        return {
+            "name": graph.names[person],
+            "birth": graph.births[person],
+            "movies": set(map(graph.movie_ids.__getitem__, graph.movies_for(person)))
+        }
+
+
+class MovieRecords(GraphRecords):
+    """
+    Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids).
+    """
+
+    def in_graph(self, key):
+        return key in self.graph.movie_index
+
+    def count_graph_keys(self):
+        return len(self.graph.movie_ids)
+
+    def graph_keys(self):
+        return self.graph.movie_ids
+
+    def graph_record(self, key):
+        graph = self.graph
+        movie = graph.movie_index[key]
+        return {
+            "title": graph.titles[movie],
+            "year": graph.years[movie],
+            "stars": set(map(graph.person_ids.__getitem__, graph.stars_for(movie)))
+        }
+
+
+class NameRecords(GraphRecords):
+    """
+    Maps lowercase names to a set of corresponding person_ids.
+    """
+
+    def in_graph(self, key):
+        return len(self.graph.name_range(key)) > 0
+
+    def graph_keys(self):
+        previous = None
+        for key in self.graph.name_keys:
+            if key != previous:
+                yield key
+                previous = key
+
+    def graph_record(self, key):
+        graph = self.graph
+        return {graph.person_ids[graph.name_people[i]] for i in graph.name_range(key)}
@@ -1,66 +1,214 @@
 import csv
+import heapq
+import json
+import multiprocessing
+import os
 import sys
+from collections import OrderedDict
 
+from compact import MovieRecords, NameRecords, PersonRecords
+from landmarks import LandmarkIndex, build_index
+from nameindex import choose_person
+from snapshot import load_graph, source_stats
 from util import Node, StackFrontier, QueueFrontier
 
 # Maps names to a set of corresponding person_ids
-names = {}
+names = NameRecords()
 
 # Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
-people = {}
+people = PersonRecords()
 
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
-movies = {}
+movies = MovieRecords()
 
+# Landmark distance index for landmark_shortest_path, if one is loaded
+landmark_index = None
 
-def load_data(directory):
+# Sizes and times of the CSV files the loaded data was read from,
+# or None once rows have been ingested on top of them
+data_fingerprint = None
+
+
+def load_data(directory, use_snapshot=True):
     """
-    Load data from CSV files into memory.
+    Load data from CSV files into memory, replacing any data loaded before.
+
+    Unless use_snapshot is False, the data is served from a binary
+    snapshot next to the CSV files, which is written on first load
+    and rebuilt whenever the CSV files change.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
 
-    # Load movies
+    # Cached paths and landmark distances may no longer hold for the new data
+    global landmark_index, data_fingerprint
+    path_cache.clear()
+    landmark_index = None
+    data_fingerprint = source_stats(directory)
+
+    if use_snapshot:
+        load_graph_data(load_graph(directory))
+        return
+    load_graph_data(None)
+
+    # Load people, movies and the stars linking them
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        ingest_people(csv.DictReader(f))
     with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
+        ingest_movies(csv.DictReader(f))
     with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+        ingest_stars(csv.DictReader(f))
+
+
+def load_delta(directory):
+    """
+    Adds the rows of whichever of people.csv, movies.csv and stars.csv
+    exist in the directory to the data already in memory.
+
+    Returns a dictionary mapping each file found to its
+    (accepted, rejected) row counts.
+    """
+    counts = {}
+    for filename, ingest in (("people.csv", ingest_people),
+                             ("movies.csv", ingest_movies),
+                             ("stars.csv", ingest_stars)):
+        try:
+            with open(f"{directory}/{filename}", encoding="utf-8") as f:
+                counts[filename] = ingest(csv.DictReader(f))
+        except FileNotFoundError:
+            continue
+    return counts
+
+
+def ingest_people(rows):
+    """
+    Adds people from rows with an id, name and birth.
+
+    Rows missing an id or name, or repeating a known id, are rejected.
+    Returns the (accepted, rejected) row counts.
+    """
+    accepted = rejected = 0
+    for row in rows:
+        if not row.get("id") or row.get("name") is None or row["id"] in people:
+            rejected += 1
+            continue
+        people[row["id"]] = {
+            "name": row["name"],
+            "birth": row.get("birth") or "",
+            "movies": set()
+        }
+        if row["name"].lower() not in names:
+            names[row["name"].lower()] = {row["id"]}
+        else:
+            names.editable(row["name"].lower()).add(row["id"])
+        accepted += 1
+    return accepted, rejected
+
+
+def ingest_movies(rows):
+    """
+    Adds movies from rows with an id, title and year.
+
+    Rows missing an id or title, or repeating a known id, are rejected.
+    Returns the (accepted, rejected) row counts.
+    """
+    accepted = rejected = 0
+    for row in rows:
+        if not row.get("id") or row.get("title") is None or row["id"] in movies:
+            rejected += 1
+            continue
+        movies[row["id"]] = {
+            "title": row["title"],
+            "year": row.get("year") or "",
+            "stars": set()
+        }
+        accepted += 1
+    return accepted, rejected
+
+
+def ingest_stars(rows):
+    """
+    Links people to movies from rows with a person_id and movie_id.
+
+    Rows naming an unknown person or movie are rejected. As new links
+    can shorten paths, cached paths are cleared and the landmark index
+    is marked stale once any are accepted, and the data no longer
+    matches the fingerprint of the files it was loaded from.
+    Returns the (accepted, rejected) row counts.
+    """
+    global data_fingerprint
+    accepted = rejected = 0
+    for row in rows:
+        person_id = row.get("person_id")
+        movie_id = row.get("movie_id")
+        if person_id not in people or movie_id not in movies:
+            rejected += 1
+            continue
+        people.editable(person_id)["movies"].add(movie_id)
+        movies.editable(movie_id)["stars"].add(person_id)
+        accepted += 1
+    if accepted:
+        path_cache.clear()
+        data_fingerprint = None
+        if landmark_index is not None:
+            landmark_index.stale = True
+    return accepted, rejected
+
+
+def load_landmarks(filename, count=32):
+    """
+    Loads the landmark index for landmark_shortest_path from a file,
+    building it over count landmarks and saving it there instead if the
+    file does not exist or was built from other data than that loaded.
+    """
+    global landmark_index
+    if os.path.exists(filename):
+        landmark_index = LandmarkIndex.load(filename)
+        if data_fingerprint is not None and landmark_index.fingerprint == data_fingerprint:
+            return landmark_index
+    landmark_index = build_index(people, movies, count, fingerprint=data_fingerprint)
+    landmark_index.save(filename)
+    return landmark_index
+
+
+def load_graph_data(graph):
+    """
+    Serve names, people and movies from a CompactGraph, or empty them
+    if graph is None.
+
+    Records are read from the graph the first time they are looked up,
+    so no per-person structures are built while loading.
+    """
+    for records in (names, people, movies):
+        records.attach(graph)
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    usage = "Usage: python degrees.py [directory] [--batch pairs.csv [--processes n]]"
+    args = sys.argv[1:]
+    options = {}
+    while len(args) >= 2 and args[-2] in ("--batch", "--processes"):
+        options[args[-2]] = args[-1]
+        args = args[:-2]
+    if len(args) > 1 or ("--processes" in options and "--batch" not in options):
+        sys.exit(usage)
+    directory = args[0] if len(args) == 1 else "large"
+    batch_file = options.get("--batch")
+    try:
+        processes = int(options["--processes"]) if "--processes" in options else None
+    except ValueError:
+        sys.exit(usage)
 
     # Load data from files into memory
-    print("Loading data...")
+    print("Loading data...", file=sys.stderr if batch_file else sys.stdout)
     load_data(directory)
-    print("Data loaded.")
+    print("Data loaded.", file=sys.stderr if batch_file else sys.stdout)
+
+    # Answer every pair in the batch file as JSON lines
+    if batch_file is not None:
+        with open(batch_file, encoding="utf-8") as f:
+            rows = csv.DictReader(f)
+            for result in batch_results(rows, processes=processes, directory=directory):
+                print(json.dumps(result))
+        return
 
     source = person_id_for_name(input("Name: "))
     if source is None:
@@ -69,7 +217,7 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = cached_shortest_path(source, target)
 
     if path is None:
         print("Not connected.")
@@ -84,25 +232,30 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, stats=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    If a stats dictionary is given, the number of people expanded,
+    movies expanded and edges touched by the search are stored in it.
     """
-    
-    # Keep track of number of movies explored
-    movies_explored = 0
-    
+
+    # Keep track of the work done by the search
+    counts = stats if stats is not None else {}
+    counts.update(people_expanded=0, movies_expanded=0, edges_touched=0)
+
     # Initialize frontier to just the starting position
     start = Node(state=source, parent=None, action=None)
     frontier = QueueFrontier()
     frontier.add(start)
-    
-    # Initialize an empty explored set
+
+    # Initialize empty explored sets for people and movies
     explored = set()
-    
+    explored_movies = set()
+
     # Keep looping until solution found
     while True:
 
@@ -115,10 +268,21 @@ def shortest_path(source, target):
 
         # Mark node as explored
         explored.add(node.state)
+        counts["people_expanded"] += 1
 
         # Add nodes to frontier
         for action in people[node.state]["movies"]:
-            for state in movies[action]["stars"]:
+            counts["edges_touched"] += 1
+
+            # A movie's cast only needs to be expanded once
+            if action in explored_movies:
+                continue
+            explored_movies.add(action)
+            counts["movies_expanded"] += 1
+            stars = movies[action]["stars"]
+            counts["edges_touched"] += len(stars)
+
+            for state in stars:
                 if not frontier.contains_state(state) and state not in explored:
                     child = Node(state=state, parent=node, action=action)
                     if child.state == target:
@@ -137,14 +301,337 @@ def shortest_path(source, target):
                         frontier.add(child)
 
 
-def person_id_for_name(name):
+def bidirectional_shortest_path(source, target, stats=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching breadth-first
+    from both ends at once until the two searches meet.
+
+    If no possible path, returns None.
+
+    If a stats dictionary is given, the number of people expanded,
+    movies expanded and edges touched by the search are stored in it.
+    """
+
+    # Keep track of the work done by both searches
+    counts = stats if stats is not None else {}
+    counts.update(people_expanded=0, movies_expanded=0, edges_touched=0)
+
+    # A person is zero degrees away from themselves
+    if source == target:
+        return []
+
+    # Map each reached person to the (movie_id, person_id) they were reached from
+    forward_parents = {source: None}
+    backward_parents = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    # Each search expands a movie's cast at most once
+    forward_movies = set()
+    backward_movies = set()
+
+    # Keep looping until the searches meet or one side runs out of people
+    while forward_frontier and backward_frontier:
+
+        # Always grow the smaller frontier by one whole level
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = expand_level(
+                forward_frontier, forward_parents, backward_parents,
+                forward_movies, counts
+            )
+        else:
+            backward_frontier, meeting = expand_level(
+                backward_frontier, backward_parents, forward_parents,
+                backward_movies, counts
+            )
+
+        # The first meeting point found lies on a shortest path
+        if meeting is not None:
+            return join_paths(meeting, forward_parents, backward_parents)
+
+    return None
+
+
+def expand_level(frontier, parents, other_parents, explored_movies, counts):
+    """
+    Expands every person in the frontier by one degree, skipping
+    movies this search has already expanded and updating counts.
+
+    Returns the next frontier and the first person that has also been
+    reached by the other search, or None if the searches have not met.
+    """
+    next_frontier = []
+    for person_id in frontier:
+        counts["people_expanded"] += 1
+        for movie_id in people[person_id]["movies"]:
+            counts["edges_touched"] += 1
+            if movie_id in explored_movies:
+                continue
+            explored_movies.add(movie_id)
+            counts["movies_expanded"] += 1
+            stars = movies[movie_id]["stars"]
+            counts["edges_touched"] += len(stars)
+            for state in stars:
+                if state in parents:
+                    continue
+                parents[state] = (movie_id, person_id)
+                if state in other_parents:
+                    return next_frontier, state
+                next_frontier.append(state)
+    return next_frontier, None
+
+
+def join_paths(meeting, forward_parents, backward_parents):
+    """
+    Returns the (movie_id, person_id) path through the meeting person,
+    built from the parents recorded by both searches.
+    """
+
+    # Walk back from the meeting person to the source
+    path = []
+    state = meeting
+    while forward_parents[state] is not None:
+        movie_id, parent = forward_parents[state]
+        path.append((movie_id, state))
+        state = parent
+    path.reverse()
+
+    # Walk forward from the meeting person to the target
+    state = meeting
+    while backward_parents[state] is not None:
+        movie_id, child = backward_parents[state]
+        path.append((movie_id, child))
+        state = child
+
+    return path
+
+
+class PathCache():
+    """
+    Least recently used cache of shortest paths keyed on (source, target).
+
+    A path cached for (source, target) also answers (target, source)
+    by walking it backwards.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get(self, source, target):
+        """
+        Returns (True, path) if a path between the two people is cached,
+        or (False, None) otherwise.
+        """
+        if (source, target) in self.paths:
+            self.hits += 1
+            self.paths.move_to_end((source, target))
+            path = self.paths[(source, target)]
+            return True, None if path is None else list(path)
+        if (target, source) in self.paths:
+            self.hits += 1
+            self.paths.move_to_end((target, source))
+            path = self.paths[(target, source)]
+            return True, None if path is None else reverse_path(target, path)
+        self.misses += 1
+        return False, None
+
+    def put(self, source, target, path):
+        """
+        Caches the path, evicting the least recently used entries
+        once the cache holds more than capacity paths.
+        """
+        self.paths[(source, target)] = None if path is None else tuple(path)
+        self.paths.move_to_end((source, target))
+        while len(self.paths) > self.capacity:
+            self.paths.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every cached path, keeping the hit and miss counters.
+        """
+        self.paths.clear()
+
+
+# Cache used by cached_shortest_path, cleared whenever data is loaded
+path_cache = PathCache()
+
+
+def cached_shortest_path(source, target):
+    """
+    Returns the same path as bidirectional_shortest_path,
+    answering repeated queries from path_cache.
+    """
+    found, path = path_cache.get(source, target)
+    if not found:
+        path = bidirectional_shortest_path(source, target)
+        path_cache.put(source, target, path)
+    return path
+
+
+def reverse_path(source, path):
+    """
+    Returns the (movie_id, person_id) path from the end of
+    the given path back to its source.
+    """
+    states = [source] + [person_id for _, person_id in path]
+    return [(path[i][0], states[i]) for i in reversed(range(len(path)))]
+
+
+def shortest_path_dag(source, target):
+    """
+    Returns (state_movies, movie_parents) for every shortest path from
+    the source to the target, where state_movies maps each person to the
+    movies that first reached them and movie_parents maps each expanded
+    movie to its stars one degree closer to the source.
+
+    A layered breadth-first search is run once. Returns None if there
+    is no possible path.
+    """
+    # Degrees from the source to every person reached so far
+    depths = {source: 0}
+    state_movies = {}
+    movie_parents = {}
+
+    # Expand whole levels until the level containing the target is complete
+    frontier = [source]
+    depth = 0
+    while frontier and target not in depths:
+        next_frontier = []
+        for person_id in frontier:
+            for movie_id in people[person_id]["movies"]:
+                if movie_id in movie_parents:
+                    continue
+                movie_parents[movie_id] = []
+                for state in movies[movie_id]["stars"]:
+                    if state not in depths:
+                        depths[state] = depth + 1
+                        state_movies[state] = [movie_id]
+                        next_frontier.append(state)
+                    elif depths[state] == depth + 1:
+                        state_movies[state].append(movie_id)
+                    elif depths[state] == depth:
+                        movie_parents[movie_id].append(state)
+        frontier = next_frontier
+        depth += 1
+
+    if target not in depths:
+        return None
+    return state_movies, movie_parents
+
+
+def all_shortest_paths(source, target):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs
+    that connect the source to the target.
+
+    The paths are walked lazily back from the target through the
+    layered search. Yields nothing if there is no possible path.
+    """
+    if source == target:
+        yield []
+        return
+
+    dag = shortest_path_dag(source, target)
+    if dag is None:
+        return
+    state_movies, movie_parents = dag
+
+    def paths_to(state):
+        if state == source:
+            yield []
+            return
+        for movie_id in state_movies[state]:
+            for parent in movie_parents[movie_id]:
+                for path in paths_to(parent):
+                    yield path + [(movie_id, state)]
+
+    yield from paths_to(target)
+
+
+def movie_year(movie_id):
+    """
+    Returns the year a movie was released, or 0 if it is unknown.
+    """
+    year = movies[movie_id]["year"]
+    return int(year) if year.isdigit() else 0
+
+
+def latest_year(path):
+    """
+    Returns the year of the most recent movie in a path,
+    or 0 if no year is known.
+    """
+    return max((movie_year(movie_id) for movie_id, _ in path), default=0)
+
+
+def top_shortest_paths(source, target, k):
+    """
+    Returns up to k shortest paths from the source to the target,
+    those with the most recent movie first.
+
+    Paths are built back from the target best first, knowing the most
+    recent movie on the way from the source to every person, so only
+    the k paths returned are ever completed.
+    """
+    if source == target:
+        return [[]]
+    dag = shortest_path_dag(source, target)
+    if dag is None:
+        return []
+    state_movies, movie_parents = dag
+
+    # Latest year of any shortest path from the source to each person
+    best_years = {source: 0}
+
+    def best_year(state):
+        if state not in best_years:
+            best_years[state] = max(
+                max(movie_year(movie_id), best_year(parent))
+                for movie_id in state_movies[state]
+                for parent in movie_parents[movie_id]
+            )
+        return best_years[state]
+
+    # Partial paths from a person to the target, by the latest year any
+    # of their completions can reach, then longest first so that ties
+    # are followed down to the source, then in the order found
+    frontier = [(-best_year(target), 0, 0, target, 0, [])]
+    found = 1
+    paths = []
+    while frontier and len(paths) < k:
+        _, _, _, state, year, path = heapq.heappop(frontier)
+        if state == source:
+            paths.append(path)
+            continue
+        for movie_id in state_movies[state]:
+            path_year = max(year, movie_year(movie_id))
+            for parent in movie_parents[movie_id]:
+                bound = max(path_year, best_year(parent))
+                heapq.heappush(frontier, (-bound, -len(path) - 1, found, parent, path_year, [(movie_id, state)] + path))
+                found += 1
+    return paths
+
+
+def person_id_for_name(name, policy=None):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    If a policy ("movies" or "birth") is given, ambiguities are
+    resolved by nameindex.choose_person instead of prompting.
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
         return None
+    elif len(person_ids) > 1 and policy is not None:
+        return choose_person(people, person_ids, policy)
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
@@ -176,5 +663,162 @@ def neighbors_for_person(person_id):
     return neighbors
 
 
+def shortest_paths_from(source, targets):
+    """
+    Returns a dictionary mapping every target to the shortest list of
+    (movie_id, person_id) pairs that connect the source to it,
+    or to None if there is no possible path.
+
+    A single breadth-first search from the source serves all targets.
+    """
+    remaining = set(targets)
+    paths = {target: None for target in remaining}
+    if source in remaining:
+        paths[source] = []
+        remaining.discard(source)
+
+    # Map each reached person to the (movie_id, person_id) they were reached from
+    parents = {source: None}
+    frontier = [source]
+
+    # Expand level by level until every target has been reached
+    explored_movies = set()
+    while frontier and remaining:
+        next_frontier = []
+        for person_id in frontier:
+            for movie_id in people[person_id]["movies"]:
+                if movie_id in explored_movies:
+                    continue
+                explored_movies.add(movie_id)
+                for state in movies[movie_id]["stars"]:
+                    if state in parents:
+                        continue
+                    parents[state] = (movie_id, person_id)
+                    next_frontier.append(state)
+                    remaining.discard(state)
+        frontier = next_frontier
+
+    # Walk back from every reached target to the source
+    for target in paths:
+        if target == source or target not in parents:
+            continue
+        path = []
+        state = target
+        while parents[state] is not None:
+            movie_id, parent = parents[state]
+            path.append((movie_id, state))
+            state = parent
+        path.reverse()
+        paths[target] = path
+
+    return paths
+
+
+def batch_shortest_paths(pairs):
+    """
+    Yields (source, target, path) for every (source, target) pair of
+    person ids, searching once per distinct source.
+
+    Results are grouped by source, in the order sources first appear.
+    """
+    targets_by_source = {}
+    for source, target in pairs:
+        targets_by_source.setdefault(source, []).append(target)
+
+    for source, targets in targets_by_source.items():
+        paths = shortest_paths_from(source, targets)
+        for target in targets:
+            yield source, target, paths[target]
+
+
+def parallel_shortest_paths(pairs, processes=None, chunksize=16, directory=None):
+    """
+    Returns the shortest path for every (source, target) pair of person ids,
+    in input order, spreading the searches across a pool of processes.
+
+    Pairs are grouped by source so each worker search serves every
+    target of its source. Workers are forked so that they share the
+    loaded data copy-on-write; where processes cannot be forked, each
+    worker loads the data from directory instead.
+    """
+    pairs = list(pairs)
+
+    # Group targets by source, remembering where each pair came from
+    targets_by_source = {}
+    for i, (source, target) in enumerate(pairs):
+        targets_by_source.setdefault(source, []).append((i, target))
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        initializer, initargs = None, ()
+    elif directory is not None:
+        context = multiprocessing.get_context("spawn")
+        initializer, initargs = load_data, (directory,)
+    else:
+        raise ValueError("directory is required when processes cannot be forked")
+
+    paths = [None] * len(pairs)
+    with context.Pool(processes, initializer, initargs) as pool:
+        tasks = targets_by_source.items()
+        for answers in pool.imap_unordered(solve_source, tasks, chunksize):
+            for i, path in answers:
+                paths[i] = path
+    return paths
+
+
+def solve_source(task):
+    """
+    Returns (position, path) pairs for one source and its
+    (position, target) pairs, used by the worker processes.
+    """
+    source, targets = task
+    paths = shortest_paths_from(source, [target for _, target in targets])
+    return [(i, paths[target]) for i, target in targets]
+
+
+def batch_results(rows, processes=None, directory=None):
+    """
+    Yields a JSON-ready dictionary for every row with a "source"
+    and "target" name, without prompting for ambiguous names.
+
+    Rows whose names cannot be resolved are reported first. The answered
+    pairs follow grouped by source or, when a number of processes is
+    given, in input order after being searched in parallel.
+    """
+    pairs = []
+    for row in rows:
+        result = {"source": row["source"], "target": row["target"]}
+        source_ids = names.get(row["source"].lower(), set())
+        target_ids = names.get(row["target"].lower(), set())
+        if len(source_ids) != 1 or len(target_ids) != 1:
+            if len(source_ids) != 1:
+                unresolved, person_ids = row["source"], source_ids
+            else:
+                unresolved, person_ids = row["target"], target_ids
+            reason = "ambiguous" if person_ids else "not found"
+            result["error"] = f"{unresolved}: {reason}"
+            yield result
+            continue
+        pairs.append((next(iter(source_ids)), next(iter(target_ids))))
+
+    if processes is None:
+        answers = batch_shortest_paths(pairs)
+    else:
+        paths = parallel_shortest_paths(pairs, processes, directory=directory)
+        answers = ((source, target, path) for (source, target), path in zip(pairs, paths))
+
+    for source, target, path in answers:
+        result = {
+            "source": people[source]["name"],
+            "target": people[target]["name"],
+            "degrees": None if path is None else len(path),
+            "path": None if path is None else [
+                {"movie": movies[movie_id]["title"], "person": people[person_id]["name"]}
+                for movie_id, person_id in path
+            ]
+        }
+        yield result
+
+
 if __name__ == "__main__":
     main()
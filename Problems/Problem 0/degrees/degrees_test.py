@@ -0,0 +1,359 @@
+"""
+Tests for degrees.py on the small dataset
+
+Make sure that this file is in the same directory as degrees.py!
+"""
+import os
+import shutil
+
+import pytest
+
+from compact import NameRecords, PersonRecords, load_compact
+from degrees import (PathCache, all_shortest_paths, batch_results,
+                     batch_shortest_paths, bidirectional_shortest_path,
+                     cached_shortest_path, ingest_movies, ingest_people,
+                     ingest_stars, load_data, load_delta, load_landmarks,
+                     latest_year, movies, names,
+                     neighbors_for_person, parallel_shortest_paths,
+                     path_cache, people, person_id_for_name, shortest_path,
+                     top_shortest_paths)
+from landmarks import LandmarkIndex, build_index, landmark_shortest_path
+from nameindex import NameIndex
+from separation import separation_report
+from snapshot import SNAPSHOT_NAME, load_graph, read_snapshot
+from util import Node, QueueFrontier, StackFrontier
+
+load_data("small")
+
+
+@pytest.fixture
+def reload_data():
+    # Undo any changes a test makes to the loaded data
+    yield
+    load_data("small")
+
+
+def check_path(source, path):
+    # Every step must be a movie shared by consecutive people
+    previous = source
+    for movie_id, person_id in path:
+        assert previous in movies[movie_id]["stars"]
+        assert person_id in movies[movie_id]["stars"]
+        previous = person_id
+    return previous
+
+
+def test_bidirectional_one_degree():
+    source = person_id_for_name("Kevin Bacon")
+    target = person_id_for_name("Tom Cruise")
+    path = bidirectional_shortest_path(source, target)
+    assert len(path) == 1
+    assert check_path(source, path) == target
+
+
+def test_bidirectional_matches_shortest_path():
+    for source in ("Valeria Golino", "Kevin Bacon", "Robin Wright"):
+        for target in ("Cary Elwes", "Dustin Hoffman", "Sally Field"):
+            source_id = person_id_for_name(source)
+            target_id = person_id_for_name(target)
+            path = bidirectional_shortest_path(source_id, target_id)
+            assert len(path) == len(shortest_path(source_id, target_id))
+            assert check_path(source_id, path) == target_id
+
+
+def test_bidirectional_not_connected():
+    source = person_id_for_name("Emma Watson")
+    target = person_id_for_name("Tom Hanks")
+    assert bidirectional_shortest_path(source, target) is None
+
+
+def test_bidirectional_same_person():
+    source = person_id_for_name("Tom Hanks")
+    assert bidirectional_shortest_path(source, source) == []
+
+
+def test_frontier_order_and_membership():
+    queue = QueueFrontier()
+    stack = StackFrontier()
+    for state in ("a", "b", "a"):
+        queue.add(Node(state=state, parent=None, action=None))
+        stack.add(Node(state=state, parent=None, action=None))
+    assert [queue.remove().state for _ in range(2)] == ["a", "b"]
+    assert queue.contains_state("a") and not queue.contains_state("b")
+    assert [stack.remove().state for _ in range(2)] == ["a", "b"]
+    assert stack.contains_state("a") and not stack.contains_state("b")
+    queue.remove()
+    assert queue.empty() and not queue.contains_state("a")
+
+
+def test_compact_graph_matches_dicts():
+    graph = load_compact("small")
+    for source in people:
+        assert graph.neighbors_for_person(source) == neighbors_for_person(source)
+        for target in people:
+            path = graph.shortest_path(source, target)
+            expected = bidirectional_shortest_path(source, target)
+            if expected is None:
+                assert path is None
+            else:
+                assert len(path) == len(expected)
+                assert check_path(source, path) == target
+
+
+def test_snapshot_written_and_reused(tmp_path):
+    directory = tmp_path / "small"
+    shutil.copytree("small", directory)
+    graph = load_graph(directory)
+    assert os.path.exists(directory / SNAPSHOT_NAME)
+
+    cached = read_snapshot(directory)
+    assert cached.person_ids == graph.person_ids
+    assert cached.titles == graph.titles
+    assert list(cached.movie_stars) == list(graph.movie_stars)
+    source = person_id_for_name("Valeria Golino")
+    target = person_id_for_name("Cary Elwes")
+    assert len(cached.shortest_path(source, target)) == 5
+
+
+def test_snapshot_records_built_on_lookup(tmp_path):
+    directory = tmp_path / "small"
+    shutil.copytree("small", directory)
+    load_graph(directory)
+    graph = read_snapshot(directory)
+
+    records = PersonRecords()
+    records.attach(graph)
+    assert not records.records
+    assert records["102"]["name"] == "Kevin Bacon"
+    assert not records.records
+    assert set(records) == set(graph.person_ids)
+    assert len(records) == len(graph.person_ids)
+    assert records["102"]["movies"] == people["102"]["movies"]
+
+    # Only records taken for editing are kept
+    records.editable("102")["movies"].add("1")
+    assert list(records.records) == ["102"]
+    assert "1" in records["102"]["movies"]
+
+    del records["102"]
+    assert "102" not in records and len(records) == len(graph.person_ids) - 1
+    records["102"] = {"name": "Kevin Bacon", "birth": "", "movies": set()}
+    assert "102" in records and len(records) == len(graph.person_ids)
+    records["new"] = {"name": "New Person", "birth": "", "movies": set()}
+    assert len(records) == len(graph.person_ids) + 1 and list(records)[-1] == "new"
+    del records["new"]
+    assert len(records) == len(graph.person_ids) and "new" not in records
+
+    names_records = NameRecords()
+    names_records.attach(graph)
+    assert dict(names_records) == {name: set(person_ids) for name, person_ids in names.items()}
+
+
+def test_snapshot_stale_after_csv_change(tmp_path):
+    directory = tmp_path / "small"
+    shutil.copytree("small", directory)
+    load_graph(directory)
+    with open(directory / "stars.csv", "a") as f:
+        f.write("914612,109830\n")
+    assert read_snapshot(directory) is None
+
+    graph = load_graph(directory)
+    source = person_id_for_name("Emma Watson")
+    target = person_id_for_name("Tom Hanks")
+    assert len(graph.shortest_path(source, target)) == 1
+
+
+def test_batch_matches_single_queries():
+    pairs = [(source, target) for source in people for target in people]
+    results = list(batch_shortest_paths(pairs))
+    assert len(results) == len(pairs)
+    for source, target, path in results:
+        expected = bidirectional_shortest_path(source, target)
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) == len(expected)
+            assert check_path(source, path) == target
+
+
+def test_batch_results_report_unknown_names():
+    rows = [
+        {"source": "Kevin Bacon", "target": "Tom Cruise"},
+        {"source": "Nobody", "target": "Tom Cruise"},
+    ]
+    results = list(batch_results(rows))
+    assert results[0]["error"] == "Nobody: not found"
+    assert results[1]["degrees"] == 1
+
+
+def test_parallel_paths_in_input_order():
+    pairs = [(source, target) for source in people for target in people]
+    paths = parallel_shortest_paths(pairs, processes=2, directory="small")
+    assert len(paths) == len(pairs)
+    for (source, target), path in zip(pairs, paths):
+        expected = bidirectional_shortest_path(source, target)
+        if expected is None:
+            assert path is None
+        else:
+            assert len(path) == len(expected)
+            assert check_path(source, path) == target
+
+
+def test_cache_serves_reversed_pairs():
+    source = person_id_for_name("Valeria Golino")
+    target = person_id_for_name("Cary Elwes")
+    path_cache.clear()
+    hits = path_cache.hits
+    path = cached_shortest_path(source, target)
+    assert cached_shortest_path(source, target) == path
+    reverse = cached_shortest_path(target, source)
+    assert path_cache.hits == hits + 2
+    assert len(reverse) == 5
+    assert check_path(target, reverse) == source
+
+    load_data("small")
+    assert len(path_cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PathCache(capacity=2)
+    cache.put("a", "b", [("m", "b")])
+    cache.put("a", "c", None)
+    assert cache.get("b", "a") == (True, [("m", "a")])
+    cache.put("a", "d", [])
+    assert cache.get("a", "c") == (False, None)
+    assert cache.get("a", "b")[0] and cache.get("a", "d")[0]
+    assert cache.misses == 1
+
+
+def test_landmark_search_finds_shortest_paths(tmp_path):
+    index = build_index(people, movies, count=2)
+    index.save(tmp_path / "landmarks.csv")
+    index = LandmarkIndex.load(tmp_path / "landmarks.csv")
+    for source in people:
+        for target in people:
+            stats = {}
+            path = landmark_shortest_path(people, movies, index, source, target, stats)
+            expected = bidirectional_shortest_path(source, target)
+            assert stats["people_expanded"] <= len(people)
+            if expected is None:
+                assert path is None
+            else:
+                assert len(path) == len(expected)
+                assert check_path(source, path) == target
+
+
+def test_landmark_search_after_ingest(tmp_path, reload_data):
+    index = build_index(people, movies, count=2)
+    ingest_people([{"id": "777", "name": "New Person", "birth": ""}])
+    ingest_stars([{"person_id": "777", "movie_id": "112384"}])
+    assert len(bidirectional_shortest_path("777", "102")) == 1
+    assert len(landmark_shortest_path(people, movies, index, "777", "102")) == 1
+    assert len(landmark_shortest_path(people, movies, index, "102", "777")) == 1
+
+    # A loaded index is refused once new stars make it stale
+    index = load_landmarks(tmp_path / "landmarks.csv", count=2)
+    assert len(landmark_shortest_path(people, movies, index, "777", "102")) == 1
+    ingest_stars([{"person_id": "914612", "movie_id": "112384"}])
+    assert index.stale
+    with pytest.raises(ValueError):
+        landmark_shortest_path(people, movies, index, "914612", "102")
+    assert len(shortest_path("914612", "102")) == 1
+
+
+def test_landmark_index_rebuilt_for_changed_data(tmp_path, reload_data):
+    filename = tmp_path / "landmarks.csv"
+    index = load_landmarks(filename, count=2)
+    assert load_landmarks(filename, count=2).distances == index.distances
+
+    # Emma Watson joins a movie with Tom Hanks in a copy of the data
+    directory = tmp_path / "small"
+    shutil.copytree("small", directory)
+    with open(directory / "stars.csv", "a") as f:
+        f.write("914612,109830\n")
+    load_data(directory)
+    index = load_landmarks(filename, count=2)
+    source = person_id_for_name("Emma Watson")
+    target = person_id_for_name("Tom Hanks")
+    assert len(landmark_shortest_path(people, movies, index, source, target)) == 1
+
+
+def test_ingest_delta_rows(tmp_path, reload_data):
+    with open(tmp_path / "people.csv", "w") as f:
+        f.write('id,name,birth\n9000001,"Delta Person",1990\n102,"Kevin Bacon",1958\n')
+    with open(tmp_path / "movies.csv", "w") as f:
+        f.write('id,title,year\n9000002,"Delta Movie",2020\n')
+    with open(tmp_path / "stars.csv", "w") as f:
+        f.write("person_id,movie_id\n9000001,9000002\n914612,9000002\n1,9000002\n")
+    counts = load_delta(tmp_path)
+    assert counts == {"people.csv": (1, 1), "movies.csv": (1, 0), "stars.csv": (2, 1)}
+
+    source = person_id_for_name("Delta Person")
+    target = person_id_for_name("Emma Watson")
+    assert len(cached_shortest_path(source, target)) == 1
+    assert ingest_people([{"id": "", "name": "Nobody"}]) == (0, 1)
+    assert ingest_movies([{"title": "Untitled"}]) == (0, 1)
+    assert ingest_stars([{"person_id": source}]) == (0, 1)
+
+
+def test_search_stats_expand_each_movie_once():
+    source = person_id_for_name("Valeria Golino")
+    target = person_id_for_name("Cary Elwes")
+    for search in (shortest_path, bidirectional_shortest_path):
+        stats = {}
+        assert len(search(source, target, stats=stats)) == 5
+        assert 0 < stats["movies_expanded"] <= len(movies)
+        assert stats["people_expanded"] <= len(people)
+        assert stats["edges_touched"] >= stats["movies_expanded"]
+
+
+def test_name_index_prefix_and_fuzzy():
+    index = NameIndex(names, people)
+    hanks = person_id_for_name("Tom Hanks")
+    cruise = person_id_for_name("Tom Cruise")
+    assert set(index.complete("tom ")) == {hanks, cruise}
+    assert index.complete("tom h") == [hanks]
+    assert index.fuzzy("Tom Hnks", max_distance=1) == [hanks]
+    assert index.fuzzy("Tom Hnks", max_distance=0) == []
+    assert index.fuzzy("Tom Hanks", max_distance=0) == [hanks]
+    assert index.fuzzy("Tom Hanksy", max_distance=1) == [hanks]
+    assert index.fuzzy("Tmo Hanks", max_distance=1) == []
+    assert index.tries is None
+    assert index.fuzzy("Tmo Hanks", max_distance=2) == [hanks]
+    assert index.resolve("tom hankz") == hanks
+    assert index.resolve("Nobody At All") is None
+
+
+def test_ambiguous_names_resolved_by_policy(reload_data):
+    ingest_people([{"id": "9000003", "name": "Kevin Bacon", "birth": "1900"}])
+    assert person_id_for_name("Kevin Bacon", policy="movies") == "102"
+    assert person_id_for_name("Kevin Bacon", policy="birth") == "9000003"
+
+
+def test_all_shortest_paths():
+    source = person_id_for_name("Valeria Golino")
+    target = person_id_for_name("Cary Elwes")
+    paths = list(all_shortest_paths(source, target))
+
+    # Kevin Bacon reaches Robin Wright through either Tom Hanks or Gary Sinise
+    assert len(paths) == 2
+    assert len(set(map(tuple, paths))) == 2
+    for path in paths:
+        assert len(path) == 5
+        assert check_path(source, path) == target
+
+    assert top_shortest_paths(source, target, 1)[0] in paths
+    top = top_shortest_paths(source, target, 5)
+    assert sorted(map(tuple, top)) == sorted(map(tuple, paths))
+    assert [latest_year(path) for path in top] == sorted(map(latest_year, paths), reverse=True)
+    assert list(all_shortest_paths(source, person_id_for_name("Emma Watson"))) == []
+    assert list(all_shortest_paths(source, source)) == [[]]
+
+
+def test_separation_report_counts_every_pair():
+    report = separation_report(samples=len(people), processes=2, directory="small")
+    assert report["samples"] == len(people)
+    assert sum(report["largest_components"]) <= len(people)
+    reached = sum(report["histogram"].values())
+    assert reached + report["unreachable_pairs"] + len(people) == len(people) ** 2
+    assert report["diameter_lower_bound"] >= 5
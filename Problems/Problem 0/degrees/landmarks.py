@@ -0,0 +1,319 @@
+"""
+Landmark distance index for the degrees dataset
+
+Distances from a few landmark people to everyone else give a lower bound
+on the degrees between any two people (by the triangle inequality), which
+guides an A* search towards the target while still finding shortest paths.
+
+Adding star edges can shorten distances and make the bounds too high,
+so an index must be rebuilt once new stars are ingested, and is saved
+with a fingerprint of the data it was built from.
+"""
+
+import csv
+import heapq
+import json
+import math
+import operator
+
+# Distance stored for people a landmark cannot reach, far above any real one
+UNREACHABLE = 10 ** 6
+
+
+class LandmarkIndex():
+    """
+    Degrees of separation from every landmark to every person known
+    when the index was built, as one tuple per person with UNREACHABLE
+    where a landmark cannot reach them.
+
+    fingerprint identifies the data the index was built from, or is
+    None if that data cannot be identified again.
+    """
+
+    def __init__(self, landmarks, distances, fingerprint=None):
+        self.landmarks = landmarks
+        self.distances = distances
+        self.fingerprint = fingerprint
+
+        # Set once the graph has changed since the distances were found
+        self.stale = False
+
+        # Distances from every landmark to the nearest star of each movie searched
+        self.movie_distances = {}
+
+    def target_distances(self, target):
+        """
+        Returns the distances from every landmark to the target,
+        or None if the target was added after the index was built.
+        """
+        return self.distances.get(target)
+
+    def lower_bound(self, person_id, target_distances):
+        """
+        Returns a lower bound on the degrees from the person to the target,
+        or math.inf if some landmark proves that they are not connected.
+
+        People added after the index was built give no bound, as the
+        landmarks never had the chance to reach them.
+        """
+        distances = self.distances.get(person_id)
+        if distances is None or target_distances is None:
+            return 0
+
+        # Landmarks reaching one person but not the other give a huge difference
+        bound = max(map(abs, map(operator.sub, distances, target_distances)), default=0)
+        return math.inf if bound > UNREACHABLE // 2 else bound
+
+    def movie_bound(self, movie_id, stars, target_distances):
+        """
+        Returns a lower bound in half degrees from a movie to the target,
+        where a person reaches their movies in one half degree and the
+        other stars of those movies in another, or math.inf if some
+        landmark proves that they are not connected.
+        """
+        if movie_id not in self.movie_distances:
+            star_distances = [self.distances.get(state) for state in stars]
+            if None in star_distances or not star_distances:
+                self.movie_distances[movie_id] = None
+            else:
+                self.movie_distances[movie_id] = tuple(map(min, zip(*star_distances)))
+        distances = self.movie_distances[movie_id]
+        if distances is None or target_distances is None:
+            return 0
+
+        # A landmark is twice its distance to the nearest star plus one half degree from the movie
+        differences = list(map(operator.sub, distances, target_distances))
+        bound = max(2 * max(differences) + 1, -2 * min(differences) - 1, 0)
+        return math.inf if bound > UNREACHABLE else bound
+
+    def save(self, filename):
+        """
+        Writes the index to a CSV file with the fingerprint as JSON on its
+        first row, then one row per known person and one column per
+        landmark, leaving a cell empty where the person is not reachable.
+        """
+        with open(filename, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["fingerprint", json.dumps(self.fingerprint, sort_keys=True)])
+            writer.writerow(["person_id"] + self.landmarks)
+            for person_id, distances in self.distances.items():
+                writer.writerow([person_id] + [
+                    "" if distance == UNREACHABLE else distance for distance in distances
+                ])
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Reads an index written by save.
+        """
+        with open(filename, encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            fingerprint = None
+            if header[0] == "fingerprint":
+                fingerprint = json.loads(header[1])
+                header = next(reader)
+            landmarks = header[1:]
+            distances = {
+                row[0]: tuple(int(distance) if distance else UNREACHABLE for distance in row[1:])
+                for row in reader
+            }
+        return cls(landmarks, distances, fingerprint)
+
+
+def select_landmarks(people, count):
+    """
+    Returns the ids of the count people who starred in the most movies.
+    """
+    return heapq.nlargest(count, people, key=lambda person_id: len(people[person_id]["movies"]))
+
+
+def select_farthest_landmarks(people, movies, count):
+    """
+    Returns the ids of count people chosen one at a time as the person
+    farthest from those already chosen, starting from the person who
+    starred in the most movies.
+
+    People on the edges of the graph give far tighter lower bounds than
+    the best connected people, who are close to everyone.
+    """
+    landmarks = []
+    distances = bfs_distances(people, movies, select_landmarks(people, 1))
+    while len(landmarks) < count and distances:
+        farthest = max(distances, key=distances.get)
+        if farthest in landmarks:
+            break
+        landmarks.append(farthest)
+        distances = bfs_distances(people, movies, landmarks)
+    return landmarks
+
+
+def bfs_distances(people, movies, sources):
+    """
+    Returns the degrees of separation from the nearest of the
+    sources to every person reachable from any of them.
+    """
+    distances = {source: 0 for source in sources}
+    frontier = list(distances)
+    distance = 0
+    explored_movies = set()
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for person_id in frontier:
+            for movie_id in people[person_id]["movies"]:
+                if movie_id in explored_movies:
+                    continue
+                explored_movies.add(movie_id)
+                for state in movies[movie_id]["stars"]:
+                    if state not in distances:
+                        distances[state] = distance
+                        next_frontier.append(state)
+        frontier = next_frontier
+    return distances
+
+
+def build_index(people, movies, count=32, landmarks=None, fingerprint=None):
+    """
+    Returns a LandmarkIndex over the given landmark ids, or over
+    count landmarks chosen by select_farthest_landmarks, recording
+    the fingerprint of the data.
+    """
+    if landmarks is None:
+        landmarks = select_farthest_landmarks(people, movies, count)
+    searches = [bfs_distances(people, movies, [landmark]) for landmark in landmarks]
+    distances = {
+        person_id: tuple(search.get(person_id, UNREACHABLE) for search in searches)
+        for person_id in people
+    }
+    return LandmarkIndex(list(landmarks), distances, fingerprint)
+
+
+def landmark_shortest_path(people, movies, index, source, target, stats=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, using A* search
+    with the landmark lower bound as its heuristic.
+
+    If no possible path, returns None.
+
+    If a stats dictionary is given, the number of people expanded,
+    movies expanded and edges touched by the search are stored in it.
+    """
+    if index.stale:
+        raise ValueError("landmark index is stale, rebuild it after ingesting stars")
+
+    # Keep track of the work done by the search
+    counts = stats if stats is not None else {}
+    counts.update(people_expanded=0, movies_expanded=0, edges_touched=0)
+
+    if source == target:
+        return []
+    target_distances = index.target_distances(target)
+    if index.lower_bound(source, target_distances) == math.inf:
+        return None
+
+    # Costs and estimates are counted in half degrees: a person reaches
+    # their movies in one half degree and the other stars in another, so
+    # people sit at even costs and movies at odd ones. The frontier holds
+    # a list for every estimate of cost so far plus the lower bound, and
+    # every cost within it. Nodes enter it with their parent's estimate,
+    # which never exceeds their own, and their lower bound is only
+    # computed once they are taken from it, so a movie whose stars cannot
+    # lead to the target soon enough is never expanded.
+    frontier = []
+    push(frontier, 0, 0, source)
+    parents = {source: None}
+    costs = {source: 0}
+    movie_parents = {}
+    movie_costs = {}
+    bounds = {}
+    explored = set()
+    explored_movies = set()
+
+    estimate = 0
+    while estimate < len(frontier):
+
+        # Nothing left in the frontier can reach the target any sooner
+        if estimate >= costs.get(target, math.inf):
+            break
+
+        # Take the deepest node with the lowest estimate
+        level = frontier[estimate]
+        while level and not level[-1]:
+            level.pop()
+        if not level:
+            estimate += 1
+            continue
+        cost = len(level) - 1
+        node = level[cost].pop()
+
+        # Children share this node's estimate and are half a degree deeper
+        child_cost = cost + 1
+        if cost % 2 == 0:
+            person_id = node
+            if person_id in explored or costs[person_id] < cost:
+                continue
+            bound = bounds.get(person_id)
+            if bound is None:
+                bound = bounds[person_id] = 2 * index.lower_bound(person_id, target_distances)
+            if bound == math.inf:
+                continue
+            if cost + bound > estimate:
+                push(frontier, cost + bound, cost, person_id)
+                continue
+
+            explored.add(person_id)
+            counts["people_expanded"] += 1
+            person_movies = people[person_id]["movies"]
+            counts["edges_touched"] += len(person_movies)
+            for movie_id in person_movies:
+                if movie_costs.get(movie_id, UNREACHABLE) > child_cost:
+                    movie_costs[movie_id] = child_cost
+                    movie_parents[movie_id] = person_id
+                    push(frontier, estimate, child_cost, movie_id)
+        else:
+            movie_id = node
+            if movie_id in explored_movies or movie_costs[movie_id] < cost:
+                continue
+            stars = movies[movie_id]["stars"]
+            bound = index.movie_bound(movie_id, stars, target_distances)
+            if bound == math.inf:
+                continue
+            if cost + bound > estimate:
+                push(frontier, cost + bound, cost, movie_id)
+                continue
+
+            explored_movies.add(movie_id)
+            counts["movies_expanded"] += 1
+            counts["edges_touched"] += len(stars)
+            person_id = movie_parents[movie_id]
+            for state in stars:
+                if costs.get(state, UNREACHABLE) > child_cost:
+                    costs[state] = child_cost
+                    parents[state] = (movie_id, person_id)
+                    push(frontier, estimate, child_cost, state)
+
+    if target not in parents:
+        return None
+
+    path = []
+    person_id = target
+    while parents[person_id] is not None:
+        movie_id, parent = parents[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent
+    path.reverse()
+    return path
+
+
+def push(frontier, estimate, cost, node):
+    """
+    Adds a person or movie to the frontier list for its estimate and cost so far.
+    """
+    while len(frontier) <= estimate:
+        frontier.append([])
+    level = frontier[estimate]
+    while len(level) <= cost:
+        level.append([])
+    level[cost].append(node)
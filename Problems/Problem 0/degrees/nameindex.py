@@ -0,0 +1,283 @@
+"""
+Name lookup index for the degrees dataset
+
+Supports prefix completion over the sorted names, fuzzy matching within
+a bounded edit distance, and resolving ambiguous names without prompting.
+"""
+
+import array
+import bisect
+import heapq
+import os
+
+# Trie key marking the end of a name
+END = None
+
+# Bits of a deletion key holding the position of a name, and above them
+# the bits of the hash of a string left by deleting from the name
+POSITION_BITS = 32
+POSITION_MASK = (1 << POSITION_BITS) - 1
+HASH_MASK = (1 << 31) - 1
+
+
+def movie_count(people, person_id):
+    """
+    Returns the number of movies a person starred in.
+    """
+    return len(people[person_id]["movies"])
+
+
+def birth_year(people, person_id):
+    """
+    Returns a person's birth year, or None if it is unknown.
+    """
+    birth = people[person_id]["birth"]
+    return int(birth) if birth and birth.isdigit() else None
+
+
+def deletions(name):
+    """
+    Returns the name and every string left by deleting one of its characters.
+    """
+    return {name} | {name[:i] + name[i + 1:] for i in range(len(name))}
+
+
+def one_edit_distance(first, second):
+    """
+    Returns the edit distance between two strings if it is at most one,
+    else None.
+    """
+    if first == second:
+        return 0
+    if abs(len(first) - len(second)) > 1:
+        return None
+
+    # Past the common prefix, the rest must match after one edit
+    i = len(os.path.commonprefix([first, second]))
+    if len(first) == len(second):
+        matched = first[i + 1:] == second[i + 1:]
+    elif len(first) < len(second):
+        matched = first[i:] == second[i + 1:]
+    else:
+        matched = first[i + 1:] == second[i:]
+    return 1 if matched else None
+
+
+def choose_person(people, person_ids, policy="movies"):
+    """
+    Returns one of the person ids without prompting.
+
+    With the "movies" policy the person who starred in the most movies
+    is chosen, with the "birth" policy the person born earliest (people
+    with unknown birth years last). Remaining ties go to the lowest id.
+    """
+    if policy == "movies":
+        def key(person_id):
+            return (-movie_count(people, person_id), person_id)
+    elif policy == "birth":
+        def key(person_id):
+            year = birth_year(people, person_id)
+            return (year is None, year or 0, person_id)
+    else:
+        raise ValueError(f"unknown policy: {policy}")
+    return min(person_ids, key=key) if person_ids else None
+
+
+class NameIndex():
+    """
+    Index over the lowercase names that map to sets of person ids.
+
+    Movie counts used for ranking are taken when the index is built.
+    """
+
+    def __init__(self, names, people):
+        self.names = names
+        self.people = people
+
+        # Every (name, person id) pair in sorted order for prefix completion
+        self.entries = [(name, person_id) for name in sorted(names) for person_id in sorted(names[name])]
+        self.entry_names = [name for name, _ in self.entries]
+        self.entry_movies = [movie_count(people, person_id) for _, person_id in self.entries]
+
+        # Position of the entry with the most movies in every run of 2 ** level
+        # entries starting at each position, earlier entries winning ties
+        self.best = [array.array("i", range(len(self.entries)))]
+        movies = self.entry_movies
+        span = 1
+        while 2 * span <= len(self.entries):
+            previous = self.best[-1]
+            self.best.append(array.array("i", [
+                first if movies[first] >= movies[second] else second
+                for first, second in zip(previous, previous[span:])
+            ]))
+            span *= 2
+
+        # Names within one edit of each other share a string left by
+        # deleting at most one character from each. Every such string is
+        # kept as its hash above the position of its name in the distinct
+        # names, in one sorted array, so the names under a hash are found
+        # by bisecting for it
+        self.distinct_names = list(dict.fromkeys(self.entry_names))
+        self.deletion_keys = array.array("q", sorted(
+            (hash(variant) & HASH_MASK) << POSITION_BITS | position
+            for position, name in enumerate(self.distinct_names)
+            for variant in deletions(name)
+        ))
+
+        # Tries of the names of each length, with END holding the full name,
+        # only built once a search allows more than one edit
+        self.tries = None
+
+    def rank(self, matches, limit):
+        """
+        Returns up to limit person ids from (distance, name) matches,
+        closest first and then by number of movies.
+        """
+        ranked = (
+            (distance, -movie_count(self.people, person_id), name, person_id)
+            for distance, name in matches
+            for person_id in self.names[name]
+        )
+        return [match[3] for match in heapq.nsmallest(limit, ranked)]
+
+    def most_movies(self, start, end):
+        """
+        Returns the position of the entry with the most movies
+        between start and end (exclusive), the earliest on ties.
+        """
+        level = (end - start).bit_length() - 1
+        first = self.best[level][start]
+        second = self.best[level][end - (1 << level)]
+        return first if self.entry_movies[first] >= self.entry_movies[second] else second
+
+    def complete(self, prefix, limit=10):
+        """
+        Returns up to limit ids of people whose name starts with the prefix,
+        exact matches first and then by number of movies.
+
+        Only about limit entries are looked at however many names match.
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.entry_names, prefix)
+        exact_end = bisect.bisect_right(self.entry_names, prefix, start)
+        end = bisect.bisect_left(self.entry_names, prefix + "\U0010ffff", exact_end)
+
+        # Exact matches sit at the start of the range, in name and id order
+        exact = sorted(range(start, exact_end), key=lambda position: -self.entry_movies[position])
+        results = [self.entries[position][1] for position in exact[:limit]]
+
+        # Take the best entry of the best range left and split the range around it
+        ranges = []
+        if exact_end < end:
+            best = self.most_movies(exact_end, end)
+            ranges.append((-self.entry_movies[best], best, exact_end, end))
+        while ranges and len(results) < limit:
+            _, best, range_start, range_end = heapq.heappop(ranges)
+            results.append(self.entries[best][1])
+            for part_start, part_end in ((range_start, best), (best + 1, range_end)):
+                if part_start < part_end:
+                    part_best = self.most_movies(part_start, part_end)
+                    heapq.heappush(ranges, (-self.entry_movies[part_best], part_best, part_start, part_end))
+        return results
+
+    def fuzzy(self, name, max_distance=1, limit=10):
+        """
+        Returns up to limit ids of people whose name is within
+        max_distance edits of the given name, closest first.
+
+        Up to one edit, candidates come from the deletion buckets;
+        further edits walk tries of the names, built on first use.
+        """
+        name = name.lower()
+        if max_distance <= 1:
+            return self.rank(self.near_names(name, max_distance), limit)
+        if self.tries is None:
+            self.build_tries()
+        matches = []
+
+        # Distances above max_distance are all stored as too_far, and only
+        # cells within max_distance of the diagonal can be any closer
+        too_far = max_distance + 1
+        first_row = [min(i, too_far) for i in range(len(name) + 1)]
+
+        # Names differing in length by more than max_distance are never walked
+        for length in range(len(name) - max_distance, len(name) + max_distance + 1):
+            trie = self.tries.get(length)
+            if trie is None:
+                continue
+
+            # Walk the trie, keeping one row of the edit distance table per node
+            stack = [(trie, character, first_row, 1) for character in trie if character is not END]
+            while stack:
+                parent, character, previous_row, depth = stack.pop()
+                node = parent[character]
+                row = [too_far] * (len(name) + 1)
+                row[0] = min(depth, too_far)
+                for i in range(max(1, depth - max_distance), min(len(name), depth + max_distance) + 1):
+                    row[i] = min(
+                        row[i - 1] + 1,
+                        previous_row[i] + 1,
+                        previous_row[i - 1] + (name[i - 1] != character),
+                        too_far
+                    )
+
+                if END in node and row[-1] <= max_distance:
+                    matches.append((row[-1], node[END]))
+
+                # Stop descending once every prefix is too far away, counting
+                # the edits needed to make up the difference in what is left
+                left = length - depth - len(name)
+                band = range(max(0, -left - max_distance), min(len(name), -left + max_distance) + 1)
+                if any(row[i] + abs(left + i) <= max_distance for i in band):
+                    for child in node:
+                        if child is not END:
+                            stack.append((node, child, row, depth + 1))
+
+        return self.rank(matches, limit)
+
+    def near_names(self, name, max_distance):
+        """
+        Returns (distance, name) for every name within max_distance
+        edits of the name, where max_distance is 0 or 1.
+        """
+        if max_distance < 1:
+            return [(0, name)] if name in self.names else []
+        candidates = set()
+        for variant in deletions(name):
+            key = (hash(variant) & HASH_MASK) << POSITION_BITS
+            start = bisect.bisect_left(self.deletion_keys, key)
+            end = bisect.bisect_left(self.deletion_keys, key + (1 << POSITION_BITS), start)
+            candidates.update(key & POSITION_MASK for key in self.deletion_keys[start:end])
+
+        # Unrelated strings can share a hash, so every candidate is checked
+        matches = []
+        for position in candidates:
+            candidate = self.distinct_names[position]
+            distance = one_edit_distance(name, candidate)
+            if distance is not None:
+                matches.append((distance, candidate))
+        return matches
+
+    def build_tries(self):
+        """
+        Builds the tries of the names of each length for fuzzy matching.
+        """
+        self.tries = {}
+        for name in self.distinct_names:
+            node = self.tries.setdefault(len(name), {})
+            for character in name:
+                node = node.setdefault(character, {})
+            node[END] = name
+
+    def resolve(self, name, policy="movies", max_distance=1):
+        """
+        Returns the id of the person best matching the name without prompting,
+        falling back to fuzzy matching if no name matches exactly.
+
+        Returns None if no name is close enough.
+        """
+        person_ids = self.names.get(name.lower())
+        if person_ids:
+            return choose_person(self.people, person_ids, policy)
+        matches = self.fuzzy(name, max_distance=max_distance, limit=1)
+        return matches[0] if matches else None
@@ -0,0 +1,154 @@
+"""
+Degree-of-separation statistics for the degrees dataset
+
+Usage: python separation.py [directory] [samples] [processes]
+
+Reports connected components, eccentricity estimates and a histogram
+of separation distances from a random sample of source people, with
+the per-source searches spread across a pool of processes.
+"""
+
+import multiprocessing
+import random
+import sys
+
+import degrees
+from landmarks import bfs_distances
+
+
+def connected_components():
+    """
+    Returns the sizes of the connected components of people,
+    largest first, and a map from each person to their component.
+    """
+    component_of = {}
+    sizes = []
+    for person_id in degrees.people:
+        if person_id in component_of:
+            continue
+        reached = bfs_distances(degrees.people, degrees.movies, [person_id])
+        for state in reached:
+            component_of[state] = len(sizes)
+        sizes.append(len(reached))
+
+    # Renumber components from largest to smallest
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i])
+    rank = {component: i for i, component in enumerate(order)}
+    return [sizes[i] for i in order], {
+        person_id: rank[component] for person_id, component in component_of.items()
+    }
+
+
+def source_statistics(source):
+    """
+    Returns the histogram of distances from the source to everyone it
+    reaches, its eccentricity, and a person at that distance.
+    """
+    distances = bfs_distances(degrees.people, degrees.movies, [source])
+    histogram = {}
+    farthest, eccentricity = source, 0
+    for person_id, distance in distances.items():
+        if distance == 0:
+            continue
+        histogram[distance] = histogram.get(distance, 0) + 1
+        if distance > eccentricity:
+            farthest, eccentricity = person_id, distance
+    return histogram, eccentricity, farthest
+
+
+def sample_statistics(sources, processes=None, directory=None):
+    """
+    Returns source_statistics for every source, in order, computed on a
+    pool of processes.
+
+    Workers are forked so that they share the loaded data copy-on-write;
+    where processes cannot be forked, each worker loads the directory.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        initializer, initargs = None, ()
+    elif directory is not None:
+        context = multiprocessing.get_context("spawn")
+        initializer, initargs = degrees.load_data, (directory,)
+    else:
+        raise ValueError("directory is required when processes cannot be forked")
+
+    with context.Pool(processes, initializer, initargs) as pool:
+        return pool.map(source_statistics, sources)
+
+
+def separation_report(samples=100, processes=None, directory=None, seed=0):
+    """
+    Returns a dictionary of statistics over the loaded data.
+
+    The eccentricity of every sampled person is exact within their
+    component; the diameter is a lower bound refined by a second search
+    from the farthest person found (a double sweep).
+    """
+    sizes, component_of = connected_components()
+    rng = random.Random(seed)
+    people_ids = list(degrees.people)
+    sources = rng.sample(people_ids, min(samples, len(people_ids)))
+    results = sample_statistics(sources, processes, directory)
+
+    histogram = {}
+    eccentricities = []
+    for source_histogram, eccentricity, _ in results:
+        eccentricities.append(eccentricity)
+        for distance, count in source_histogram.items():
+            histogram[distance] = histogram.get(distance, 0) + count
+
+    # Search again from the farthest person found to tighten the diameter
+    diameter = 0
+    if results:
+        _, eccentricity, farthest = max(results, key=lambda result: result[1])
+        diameter = max(eccentricity, source_statistics(farthest)[1])
+
+    # Pairs of a sampled person and someone outside their component
+    unreachable = sum(len(people_ids) - sizes[component_of[source]] for source in sources)
+    pairs = sum(histogram.values())
+
+    return {
+        "people": len(people_ids),
+        "components": len(sizes),
+        "largest_components": sizes[:5],
+        "samples": len(sources),
+        "histogram": dict(sorted(histogram.items())),
+        "unreachable_pairs": unreachable,
+        "mean_separation": sum(d * c for d, c in histogram.items()) / pairs if pairs else None,
+        "eccentricity": {
+            "min": min(eccentricities, default=None),
+            "median": sorted(eccentricities)[len(eccentricities) // 2] if eccentricities else None,
+            "max": max(eccentricities, default=None),
+        },
+        "diameter_lower_bound": diameter,
+    }
+
+
+def main():
+    if len(sys.argv) > 4:
+        sys.exit("Usage: python separation.py [directory] [samples] [processes]")
+    directory = sys.argv[1] if len(sys.argv) > 1 else "large"
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    print("Loading data...")
+    degrees.load_data(directory)
+    print("Data loaded.")
+
+    report = separation_report(samples, processes, directory)
+    print(f"People: {report['people']}")
+    print(f"Components: {report['components']} (largest {report['largest_components']})")
+    print(f"Sampled sources: {report['samples']}")
+    for distance, count in report["histogram"].items():
+        print(f"  {distance} degrees: {count}")
+    print(f"Unreachable pairs: {report['unreachable_pairs']}")
+    if report["mean_separation"] is not None:
+        print(f"Mean separation: {report['mean_separation']:.2f}")
+    eccentricity = report["eccentricity"]
+    print(f"Eccentricity: min {eccentricity['min']}, median {eccentricity['median']}, max {eccentricity['max']}")
+    print(f"Diameter: at least {report['diameter_lower_bound']}")
+
+
+if __name__ == "__main__":
+    main()
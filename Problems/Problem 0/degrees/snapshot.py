@@ -0,0 +1,144 @@
+"""
+Binary snapshot cache for the degrees dataset
+
+A snapshot stores a CompactGraph next to the CSV files it was built from,
+so later runs can map it into memory instead of parsing the CSVs again.
+"""
+
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+
+from compact import CompactGraph, load_compact
+
+SNAPSHOT_NAME = "degrees.snapshot"
+SNAPSHOT_MAGIC = b"DEGSNAP\0"
+SNAPSHOT_VERSION = 2
+
+SOURCE_FILES = ("people.csv", "movies.csv", "stars.csv")
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_stars", "name_people")
+STRINGS = ("person_ids", "names", "births", "movie_ids", "titles", "years", "name_keys")
+
+# Magic, version and length of the JSON header that follows
+PREAMBLE = struct.Struct("<8sII")
+
+
+def source_stats(directory):
+    """
+    Returns the size and modification time of every CSV file,
+    used to tell whether a snapshot is still up to date.
+    """
+    stats = {}
+    for filename in SOURCE_FILES:
+        stat = os.stat(os.path.join(directory, filename))
+        stats[filename] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def write_snapshot(directory, graph):
+    """
+    Writes the graph to a snapshot file in the directory.
+    """
+
+    # Lay out the integer arrays first, each padded to 8 bytes
+    sections = {}
+    offset = 0
+    for name in ARRAYS:
+        data = getattr(graph, name)
+        size = len(data) * data.itemsize
+        sections[name] = [offset, len(data)]
+        offset += size + (-size % 8)
+
+    # Store all strings in one NUL separated table
+    values = itertools.chain.from_iterable(getattr(graph, name) for name in STRINGS)
+    table = "\0".join(values).encode("utf-8")
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "sources": source_stats(directory),
+        "arrays": sections,
+        "strings": {name: len(getattr(graph, name)) for name in STRINGS},
+        "table": [offset, len(table)],
+    }).encode("utf-8")
+
+    # Write to a temporary file first so readers never see a partial snapshot
+    path = os.path.join(directory, SNAPSHOT_NAME)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+        f.write(header)
+        f.write(bytes(-f.tell() % 8))
+        for name in ARRAYS:
+            data = getattr(graph, name)
+            f.write(data.tobytes())
+            f.write(bytes(-len(data) * data.itemsize % 8))
+        f.write(table)
+    os.replace(temporary, path)
+
+
+def read_snapshot(directory):
+    """
+    Returns the CompactGraph stored in the directory's snapshot.
+
+    If there is no snapshot, or it was written by another version or
+    from different CSV files, returns None.
+    """
+    path = os.path.join(directory, SNAPSHOT_NAME)
+    try:
+        with open(path, "rb") as f:
+            magic, version, length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            header = json.loads(f.read(length))
+            if header["byteorder"] != sys.byteorder:
+                return None
+            if header["sources"] != source_stats(directory):
+                return None
+            start = f.tell() + (-f.tell() % 8)
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error):
+        return None
+
+    # Integer arrays are used in place from the mapped file
+    view = memoryview(buffer)
+    arrays = {}
+    for name in ARRAYS:
+        offset, count = header["arrays"][name]
+        offset += start
+        arrays[name] = view[offset:offset + 4 * count].cast("i")
+
+    # Strings are decoded once and split back into their lists
+    offset, size = header["table"]
+    table = bytes(view[start + offset:start + offset + size]).decode("utf-8")
+    values = table.split("\0")
+    strings = {}
+    position = 0
+    for name in STRINGS:
+        count = header["strings"][name]
+        strings[name] = values[position:position + count]
+        position += count
+
+    return CompactGraph(
+        strings["person_ids"], strings["names"], strings["births"],
+        strings["movie_ids"], strings["titles"], strings["years"],
+        arrays["person_offsets"], arrays["person_movies"],
+        arrays["movie_offsets"], arrays["movie_stars"],
+        strings["name_keys"], arrays["name_people"]
+    )
+
+
+def load_graph(directory):
+    """
+    Returns the CompactGraph for a directory, reading it from the
+    snapshot when it is up to date and rebuilding it otherwise.
+    """
+    graph = read_snapshot(directory)
+    if graph is None:
+        graph = load_compact(directory)
+        try:
+            write_snapshot(directory, graph)
+        except OSError:
+            pass
+    return graph
@@ -0,0 +1,150 @@
+"""
+Tic Tac Toe Player on bitboards
+
+A board is a pair of 9-bit integers (x, o) with bit 3 * i + j set
+where that player has moved on cell (i, j). The functions mirror
+those in tictactoe.py, which uses lists of lists.
+"""
+
+from tictactoe import EMPTY, O, X
+
+FULL = 0b111111111
+
+# Bits of every row, column and diagonal
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+)
+
+# Number of set bits in every 9-bit value
+POPCOUNT = [bin(bits).count("1") for bits in range(FULL + 1)]
+
+# Cell and bit of every move
+CELLS = [(bit // 3, bit % 3) for bit in range(9)]
+
+# Game value of every position searched so far
+values = {}
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return (0, 0)
+
+
+def from_board(board):
+    """
+    Returns the bitboard for a list of lists board.
+    """
+    x = o = 0
+    for i, row in enumerate(board):
+        for j, space in enumerate(row):
+            if space == X:
+                x |= 1 << (3 * i + j)
+            elif space == O:
+                o |= 1 << (3 * i + j)
+    return (x, o)
+
+
+def to_board(board):
+    """
+    Returns the list of lists board for a bitboard.
+    """
+    x, o = board
+    return [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+             for j in range(3)] for i in range(3)]
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    x, o = board
+    return X if POPCOUNT[x] == POPCOUNT[o] else O
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    x, o = board
+    empty = ~(x | o) & FULL
+    return {CELLS[bit] for bit in range(9) if empty >> bit & 1}
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    x, o = board
+    i, j = action
+    if not (0 <= i < 3 and 0 <= j < 3):
+        raise Exception("Invalid move entered")
+    move = 1 << (3 * i + j)
+    if (x | o) & move:
+        raise Exception("Invalid move entered")
+    if POPCOUNT[x] == POPCOUNT[o]:
+        return (x | move, o)
+    return (x, o | move)
+
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = board
+    for mask in WIN_MASKS:
+        if x & mask == mask:
+            return X
+        if o & mask == mask:
+            return O
+    return None
+
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    x, o = board
+    return (x | o) == FULL or winner(board) is not None
+
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    won = winner(board)
+    if won == X:
+        return 1
+    elif won == O:
+        return -1
+    return 0
+
+
+def value(board):
+    """
+    Returns the game value of the board with perfect play,
+    remembering every position searched.
+    """
+    if board in values:
+        return values[board]
+    if terminal(board):
+        best = utility(board)
+    elif player(board) == X:
+        best = max(value(result(board, action)) for action in actions(board))
+    else:
+        best = min(value(result(board, action)) for action in actions(board))
+    values[board] = best
+    return best
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    if terminal(board):
+        return None
+    choose = max if player(board) == X else min
+    return choose(sorted(actions(board)), key=lambda action: value(result(board, action)))
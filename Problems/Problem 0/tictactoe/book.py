@@ -0,0 +1,75 @@
+"""
+Opening book generator for tictactoe.py
+
+Usage: python book.py [filename]
+
+Solves every reachable position once, up to rotation and reflection,
+and writes the best move for each as one byte per board key, where the
+key is read as a base 3 number. Positions that are never reached or
+are already over hold NO_MOVE.
+"""
+
+import sys
+
+import tictactoe as ttt
+
+# Cell values for the characters of a board key
+KEY_CELLS = {code: space for space, code in ttt.CELL_CODES.items()}
+
+
+def key_board(key):
+    """
+    Returns the board whose cells are given by a board key.
+    """
+    return [[KEY_CELLS[key[3 * i + j]] for j in range(3)] for i in range(3)]
+
+
+def reachable_keys():
+    """
+    Returns the board keys of every position reachable from the initial state.
+    """
+    keys = set()
+    frontier = [ttt.initial_state()]
+    while frontier:
+        board = frontier.pop()
+        key = ttt.board_key(board)
+        if key in keys:
+            continue
+        keys.add(key)
+        if not ttt.terminal(board):
+            for action in ttt.actions(board):
+                frontier.append(ttt.result(board, action))
+    return keys
+
+
+def build_book():
+    """
+    Returns the opening book as bytes, with the move minimax chooses
+    on the board of every reachable key.
+    """
+    # Search without consulting any book already loaded
+    ttt.opening_book = None
+
+    book = bytearray([ttt.NO_MOVE]) * 3 ** 9
+    for key in reachable_keys():
+        board = key_board(key)
+        if ttt.terminal(board):
+            continue
+        i, j = ttt.minimax(board)
+        book[int(key, 3)] = 3 * i + j
+    return bytes(book)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [filename]")
+    filename = sys.argv[1] if len(sys.argv) == 2 else ttt.BOOK_FILE
+
+    book = build_book()
+    with open(filename, "wb") as f:
+        f.write(book)
+    print(f"Wrote {sum(move != ttt.NO_MOVE for move in book)} positions to {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+m,n,k-game player
+
+Generalizes tictactoe.py to boards of m rows and n columns won by k in
+a row, where searching to the end of the game is no longer feasible.
+Moves are chosen by iterative deepening alpha-beta search within a time
+budget, ordered by killer and history heuristics, with positions at the
+search horizon scored by a pluggable evaluation function.
+
+Game(3, 3, 3) plays the same game as tictactoe.py.
+"""
+
+import math
+import time
+
+from tictactoe import EMPTY, O, X
+
+# Score of a won position, above anything an evaluation returns
+WIN = 10 ** 12
+
+# Directions of the lines through a cell
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+# Killer moves remembered at each ply
+KILLERS = 2
+
+
+class Game():
+    """
+    Rules of the m,n,k-game on boards of m rows and n columns.
+    """
+
+    def __init__(self, m=3, n=3, k=3):
+        self.m = m
+        self.n = n
+        self.k = k
+
+        # Cells of every k in a row window, for evaluations
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in DIRECTIONS:
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append([(i + di * step, j + dj * step) for step in range(k)])
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        turns_X = sum(row.count(X) for row in board)
+        turns_O = sum(row.count(O) for row in board)
+        return X if turns_X == turns_O else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i, row in enumerate(board) for j, space in enumerate(row) if space == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n) or board[i][j] != EMPTY:
+            raise Exception("Invalid move entered")
+        return self.place(board, action, self.player(board))
+
+    def place(self, board, action, player):
+        """
+        Returns a new board with the player's mark on the action,
+        sharing every row but the one that changed.
+        """
+        i, j = action
+        row = list(board[i])
+        row[j] = player
+        return board[:i] + [row] + board[i + 1:]
+
+    def wins(self, board, action):
+        """
+        Returns True if the mark on the action completes k in a row.
+        """
+        i, j = action
+        mark = board[i][j]
+        for di, dj in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                step_i, step_j = i + sign * di, j + sign * dj
+                while 0 <= step_i < self.m and 0 <= step_j < self.n and board[step_i][step_j] == mark:
+                    count += 1
+                    step_i, step_j = step_i + sign * di, step_j + sign * dj
+            if count >= self.k:
+                return True
+        return False
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        for window in self.windows:
+            i, j = window[0]
+            mark = board[i][j]
+            if mark != EMPTY and all(board[i][j] == mark for i, j in window):
+                return mark
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(EMPTY not in row for row in board)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        won = self.winner(board)
+        if won == X:
+            return 1
+        elif won == O:
+            return -1
+        return 0
+
+
+def window_evaluation(game, board):
+    """
+    Returns a score for the board, positive where X is ahead.
+
+    Every window that only one player has marks in counts for that
+    player, with four times the weight for every further mark.
+    """
+    score = 0
+    for window in game.windows:
+        marks = [board[i][j] for i, j in window]
+        x_marks = marks.count(X)
+        o_marks = marks.count(O)
+        if x_marks and not o_marks:
+            score += 4 ** x_marks
+        elif o_marks and not x_marks:
+            score -= 4 ** o_marks
+    return score
+
+
+class Timeout(Exception):
+    pass
+
+
+class Searcher():
+    """
+    Iterative deepening alpha-beta search over a game.
+
+    evaluate(game, board) scores positions at the search horizon,
+    positive where X is ahead. Killer moves and the history table are
+    kept between searches, so a searcher should be reused for the moves
+    of one game.
+    """
+
+    def __init__(self, game, evaluate=window_evaluation, time_limit=1.0, max_depth=None):
+        self.game = game
+        self.evaluate = evaluate
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+
+        # Moves that caused cutoffs at each ply, most recent first
+        self.killers = {}
+
+        # Total cutoff bonus of every move, by the depth searched below it
+        self.history = {}
+
+        self.deadline = math.inf
+        self.nodes = 0
+        self.depth = 0
+
+    def order(self, moves, ply, first=None):
+        """
+        Returns the moves with the first move, then the killer moves
+        at this ply, then the rest by history score.
+        """
+        killers = self.killers.get(ply, [])
+
+        def key(action):
+            if action == first:
+                return (0, 0)
+            if action in killers:
+                return (1, killers.index(action))
+            return (2, -self.history.get(action, 0))
+
+        return sorted(moves, key=key)
+
+    def cutoff(self, action, ply, depth):
+        """
+        Remembers a move that caused a cutoff.
+        """
+        killers = self.killers.setdefault(ply, [])
+        if action in killers:
+            killers.remove(action)
+        killers.insert(0, action)
+        del killers[KILLERS:]
+        self.history[action] = self.history.get(action, 0) + depth * depth
+
+    def negamax(self, board, player, depth, alpha, beta, ply, last):
+        """
+        Returns the value of the board for the player to move,
+        searched depth moves ahead within the window (alpha, beta).
+        """
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise Timeout
+
+        # The previous player has won, sooner being better for them
+        if self.game.wins(board, last):
+            return ply - WIN
+
+        moves = self.game.actions(board)
+        if not moves:
+            return 0
+        if depth == 0:
+            score = self.evaluate(self.game, board)
+            return score if player == X else -score
+
+        opponent = O if player == X else X
+        best_value = -math.inf
+        for action in self.order(moves, ply):
+            value = -self.negamax(
+                self.game.place(board, action, player), opponent,
+                depth - 1, -beta, -alpha, ply + 1, action
+            )
+            best_value = max(best_value, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self.cutoff(action, ply, depth)
+                break
+        return best_value
+
+    def search(self, board, player, depth, moves):
+        """
+        Returns (value, action) for the best of the moves searched
+        depth moves ahead, for the player to move.
+        """
+        opponent = O if player == X else X
+        alpha = -math.inf
+        best_action = None
+        for action in moves:
+            value = -self.negamax(
+                self.game.place(board, action, player), opponent,
+                depth - 1, -math.inf, -alpha, 1, action
+            )
+            if best_action is None or value > alpha:
+                best_action, alpha = action, value
+        return alpha, best_action
+
+    def best_move(self, board):
+        """
+        Returns the best action found for the current player on the board
+        before the time limit, or None if the game is over.
+        """
+        if self.game.terminal(board):
+            return None
+
+        self.deadline = time.perf_counter() + self.time_limit
+        self.nodes = 0
+        player = self.game.player(board)
+        moves = self.game.actions(board)
+        max_depth = len(moves) if self.max_depth is None else min(self.max_depth, len(moves))
+
+        # Deepen one move at a time, searching the best move so far first
+        best_action = self.order(moves, 0)[0]
+        for depth in range(1, max_depth + 1):
+            try:
+                value, best_action = self.search(board, player, depth, self.order(moves, 0, best_action))
+            except Timeout:
+                break
+            self.depth = depth
+
+            # Stop once the game is decided within the depth searched
+            if abs(value) > WIN - max_depth - 1:
+                break
+
+        return best_action
+
+
+def minimax(game, board, time_limit=1.0, evaluate=window_evaluation, max_depth=None):
+    """
+    Returns the best action found for the current player on the board.
+    """
+    return Searcher(game, evaluate, time_limit, max_depth).best_move(board)
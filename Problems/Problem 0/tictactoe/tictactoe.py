@@ -4,7 +4,9 @@ Tic Tac Toe Player
 
 import math
 import copy
-# import os
+import json
+import multiprocessing
+import os
 
 # os.environ["SDL_VIDEODRIVER"] = "x11"
 
@@ -12,6 +14,40 @@ X = "X"
 O = "O"
 EMPTY = None
 
+# Single character codes for the cells of a board key
+CELL_CODES = {EMPTY: "0", X: "1", O: "2"}
+
+# Cell orders of the 8 rotations and reflections of a flattened board
+SYMMETRIES = [
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),
+    (8, 5, 2, 7, 4, 1, 6, 3, 0)
+]
+
+# Bound types of transposition table values
+EXACT = "exact"
+LOWER = "lower"
+UPPER = "upper"
+
+# Maps board keys to the (value, bound type) found by searching them
+transposition_table = {}
+
+# Opening book written by book.py, with one move per board key
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+NO_MOVE = 255
+opening_book = None
+
+# Bound on the root value shared by the workers of parallel_minimax
+root_bound = None
+
+# Barrier the workers of a RootPool wait at when resetting their tables
+root_barrier = None
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -117,13 +153,13 @@ def winner(board):
     """
     # Check for horizontal lines
     for row in board:
-        if all(space == row[0] for space in row):
+        if row[0] != EMPTY and all(space == row[0] for space in row):
             return row[0]
     
     # Transpose the board and check for vertical lines
     transposed_board = list(map(list, zip(*board)))
     for row in transposed_board:
-        if all(space == row[0] for space in row):
+        if row[0] != EMPTY and all(space == row[0] for space in row):
             return row[0]
             
     # Flip the board and check for diagonal lines
@@ -134,7 +170,7 @@ def winner(board):
      diagonals[1].append(flipped_board[i][i])
     
     for diagonal in diagonals:
-         if all(space == diagonal[0] for space in diagonal):
+         if diagonal[0] != EMPTY and all(space == diagonal[0] for space in diagonal):
             return diagonal[0]
     
     # If no winner is found return None
@@ -171,27 +207,237 @@ def minimax(board):
     # Check for terminal board
     if terminal(board):
         return None
-        
+
+    # Play the book move if there is one
+    action = book_move(board)
+    if action is not None:
+        return action
+
     alpha = -1
     beta = 1
-        
+
+    # Search every action once, keeping the best for the current player
+    best_action = None
     if player(board) == X:
-        max_X = max_value(board, alpha, beta)
-        
+        best_value = -math.inf
         for action in actions(board):
-            if min_value(result(board, action), alpha, beta) == max_X:
-                return action
+            value = min_value(result(board, action), alpha, beta)
+            if value > best_value:
+                best_action, best_value = action, value
+            alpha = max(alpha, value)
+            if beta <= alpha:
+                break
     else:
-        min_O = min_value(board, alpha, beta)
-        
+        best_value = math.inf
         for action in actions(board):
-            if max_value(result(board, action), alpha, beta) == min_O:
-                return action
+            value = max_value(result(board, action), alpha, beta)
+            if value < best_value:
+                best_action, best_value = action, value
+            beta = min(beta, value)
+            if beta <= alpha:
+                break
+
+    return best_action
+
+def init_root_worker(bound, barrier):
+    """
+    Shares the bound on the root value and the reset barrier with a
+    parallel_minimax worker.
+    """
+    global root_bound, root_barrier
+    root_bound = bound
+    root_barrier = barrier
+
+def reset_root_worker(_):
+    """
+    Clears a worker's transposition table, then waits until every other
+    worker has taken its own reset, so no worker resets twice.
+    """
+    reset_transposition_table()
+    root_barrier.wait()
+
+def root_value(board, action):
+    """
+    Returns the value of an action at the root, exact if it could equal
+    the best value any worker has found, else a bound worse than it.
+    """
+    new_board = result(board, action)
+    if player(board) == X:
+        value = min_value(new_board, root_bound.value, 1)
+        with root_bound.get_lock():
+            root_bound.value = max(root_bound.value, value - 0.5)
+    else:
+        value = max_value(new_board, -1, root_bound.value)
+        with root_bound.get_lock():
+            root_bound.value = min(root_bound.value, value + 0.5)
+    return value
+
+class RootPool():
+    """
+    Pool of processes for parallel_minimax with the bound they share.
+
+    Workers live as long as the pool, so they keep their transposition
+    tables from one search to the next: reuse one pool for every move of
+    a game, one search at a time, and close it (or use it in a with
+    statement) when done. reset_transposition_tables clears them between
+    unrelated searches.
+    """
+
+    def __init__(self, processes=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.bound = multiprocessing.Value("d", 0)
+        self.barrier = multiprocessing.Barrier(self.processes)
+        self.pool = multiprocessing.Pool(self.processes, init_root_worker, (self.bound, self.barrier))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def values(self, board, moves):
+        """
+        Returns root_value for each of the moves on the board, in order.
+        """
+        self.bound.value = -1 if player(board) == X else 1
+        return self.pool.starmap(root_value, [(board, action) for action in moves], chunksize=1)
+
+    def reset_transposition_tables(self):
+        """
+        Removes every stored position from the workers' transposition tables.
+        """
+        self.pool.map(reset_root_worker, range(self.processes), chunksize=1)
+
+def parallel_minimax(board, processes=None, pool=None, use_book=False):
+    """
+    Returns an optimal action, searching each action at the root on a
+    RootPool, or on a new pool of processes if none is given.
+
+    The opening book is only played with use_book, so batch analysis
+    searches every board; without it the action is the one minimax
+    chooses when there is no book. The workers share an aspiration
+    window that is kept half a point below the best value found (for X),
+    so every action that ties with the best is still searched exactly
+    and the first of them is chosen.
+    """
+    if terminal(board):
+        return None
+
+    if use_book:
+        action = book_move(board)
+        if action is not None:
+            return action
+
+    if pool is None:
+        with RootPool(processes) as pool:
+            return parallel_minimax(board, pool=pool)
+
+    moves = list(actions(board))
+    values = pool.values(board, moves)
+    best_value = max(values) if player(board) == X else min(values)
+    return moves[values.index(best_value)]
+
+def board_key(board):
+    """
+    Returns the same key for a board and all of its rotations and reflections.
+    """
+    cells = "".join(CELL_CODES[space] for row in board for space in row)
+    return min("".join(cells[i] for i in symmetry) for symmetry in SYMMETRIES)
+
+def lookup(board, alpha, beta):
+    """
+    Returns (key, value) for a board, where value is the stored value
+    if the transposition table settles it within (alpha, beta), else None.
+    """
+    key = board_key(board)
+    entry = transposition_table.get(key)
+    if entry is not None:
+        value, bound = entry
+        if bound == EXACT:
+            return key, value
+        if bound == LOWER and value >= beta:
+            return key, value
+        if bound == UPPER and value <= alpha:
+            return key, value
+    return key, None
+
+def store(key, value, alpha, beta):
+    """
+    Stores a value searched with the window (alpha, beta) and its bound type.
+    """
+    if value <= alpha:
+        transposition_table[key] = (value, UPPER)
+    elif value >= beta:
+        transposition_table[key] = (value, LOWER)
+    else:
+        transposition_table[key] = (value, EXACT)
+
+def reset_transposition_table():
+    """
+    Removes every stored position from the transposition table.
+    """
+    transposition_table.clear()
+
+def save_transposition_table(filename):
+    """
+    Writes the transposition table to a JSON file.
+    """
+    with open(filename, "w") as f:
+        json.dump(transposition_table, f)
+
+def load_transposition_table(filename):
+    """
+    Adds the positions stored in a JSON file to the transposition table.
+    """
+    with open(filename) as f:
+        for key, (value, bound) in json.load(f).items():
+            transposition_table[key] = (value, bound)
+
+def load_opening_book(filename=BOOK_FILE):
+    """
+    Loads the opening book from a file, or clears it if there is none.
+    """
+    global opening_book
+    try:
+        with open(filename, "rb") as f:
+            opening_book = f.read()
+    except FileNotFoundError:
+        opening_book = None
+    return opening_book
+
+def book_move(board):
+    """
+    Returns the opening book move for a board, or None if it has none.
+    """
+    if opening_book is None:
+        return None
+
+    # Find the board key and the symmetry that gives it
+    cells = "".join(CELL_CODES[space] for row in board for space in row)
+    key, symmetry = min(
+        ("".join(cells[i] for i in symmetry), symmetry) for symmetry in SYMMETRIES
+    )
+    move = opening_book[int(key, 3)]
+    if move == NO_MOVE:
+        return None
+
+    # Map the move on the key's board back onto this board
+    cell = symmetry[move]
+    return (cell // 3, cell % 3)
 
 def max_value(board, alpha, beta):
     if terminal(board):
         return utility(board)
-    
+
+    key, stored = lookup(board, alpha, beta)
+    if stored is not None:
+        return stored
+
+    alpha_original = alpha
     best_value = -math.inf
     
     for action in actions(board):
@@ -200,13 +446,19 @@ def max_value(board, alpha, beta):
         alpha = max(alpha, best_value)
         if beta <= alpha:
             break
-        
+
+    store(key, best_value, alpha_original, beta)
     return best_value
     
 def min_value(board, alpha, beta):
     if terminal(board):
         return utility(board)
-    
+
+    key, stored = lookup(board, alpha, beta)
+    if stored is not None:
+        return stored
+
+    beta_original = beta
     best_value = math.inf
     
     for action in actions(board):
@@ -215,5 +467,8 @@ def min_value(board, alpha, beta):
         beta = min(beta, best_value)
         if beta <= alpha:
             break
-    
-    return best_value
\ No newline at end of file
+
+    store(key, best_value, alpha, beta_original)
+    return best_value
+
+load_opening_book()
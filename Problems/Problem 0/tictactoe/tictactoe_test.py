@@ -0,0 +1,261 @@
+"""
+Tests for tictactoe.py
+
+Make sure that this file is in the same directory as tictactoe.py!
+"""
+import time
+
+import bitboard as bb
+import book
+import mnk
+import tictactoe as ttt
+from tictactoe import EMPTY, O, X
+
+
+def play(first_move=None):
+    # Let the AI play against itself, optionally after a given first move
+    board = ttt.initial_state()
+    if first_move is not None:
+        board = ttt.result(board, first_move)
+    while not ttt.terminal(board):
+        board = ttt.result(board, ttt.minimax(board))
+    return board
+
+
+def test_self_play_is_a_tie():
+    ttt.reset_transposition_table()
+    for first_move in [None] + sorted(ttt.actions(ttt.initial_state())):
+        assert ttt.winner(play(first_move)) is None
+
+
+def test_winner_below_an_empty_row():
+    board = [[EMPTY, EMPTY, EMPTY],
+             [X, X, X],
+             [O, O, EMPTY]]
+    assert ttt.winner(board) == X
+    assert ttt.terminal(board)
+
+
+def test_takes_the_win_and_blocks():
+    board = [[X, X, EMPTY],
+             [O, O, EMPTY],
+             [EMPTY, EMPTY, EMPTY]]
+    assert ttt.minimax(board) == (0, 2)
+    board = [[X, EMPTY, EMPTY],
+             [O, O, EMPTY],
+             [X, EMPTY, EMPTY]]
+    assert ttt.minimax(board) == (1, 2)
+
+
+def test_symmetric_boards_share_a_key():
+    board = [[X, EMPTY, EMPTY],
+             [EMPTY, O, EMPTY],
+             [EMPTY, EMPTY, EMPTY]]
+    rotated = [[EMPTY, EMPTY, X],
+               [EMPTY, O, EMPTY],
+               [EMPTY, EMPTY, EMPTY]]
+    assert ttt.board_key(board) == ttt.board_key(rotated)
+
+
+def test_transposition_table_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(ttt, "opening_book", None)
+    ttt.reset_transposition_table()
+    ttt.minimax(ttt.initial_state())
+    table = dict(ttt.transposition_table)
+    assert table
+    ttt.save_transposition_table(tmp_path / "table.json")
+    ttt.reset_transposition_table()
+    assert not ttt.transposition_table
+    ttt.load_transposition_table(tmp_path / "table.json")
+    assert ttt.transposition_table == table
+
+
+def reachable_boards():
+    # Every list of lists board reachable from the initial state
+    boards, frontier = [], [ttt.initial_state()]
+    seen = set()
+    while frontier:
+        board = frontier.pop()
+        key = str(board)
+        if key in seen:
+            continue
+        seen.add(key)
+        boards.append(board)
+        if not ttt.terminal(board):
+            frontier.extend(ttt.result(board, action) for action in ttt.actions(board))
+    return boards
+
+
+def test_bitboard_matches_lists():
+    for board in reachable_boards():
+        bits = bb.from_board(board)
+        assert bb.to_board(bits) == board
+        assert bb.player(bits) == ttt.player(board)
+        assert bb.actions(bits) == ttt.actions(board)
+        assert bb.winner(bits) == ttt.winner(board)
+        assert bb.terminal(bits) == ttt.terminal(board)
+        if bb.terminal(bits):
+            assert bb.utility(bits) == ttt.utility(board)
+        for action in bb.actions(bits):
+            assert bb.to_board(bb.result(bits, action)) == ttt.result(board, action)
+
+
+def test_bitboard_minimax_is_optimal():
+    board = bb.initial_state()
+    while not bb.terminal(board):
+        board = bb.result(board, bb.minimax(board))
+    assert bb.winner(board) is None
+    bits = bb.from_board([[X, X, EMPTY],
+                          [O, O, EMPTY],
+                          [EMPTY, EMPTY, EMPTY]])
+    assert bb.minimax(bits) == (0, 2)
+    assert bb.value(bb.initial_state()) == 0
+
+
+def test_opening_book_moves_are_optimal(tmp_path, monkeypatch):
+    # build_book clears the loaded book, so patch it first to restore it after
+    monkeypatch.setattr(ttt, "opening_book", None)
+    filename = tmp_path / "book.bin"
+    filename.write_bytes(book.build_book())
+    assert ttt.load_opening_book(filename)
+    for board in reachable_boards():
+        action = ttt.book_move(board)
+        if ttt.terminal(board):
+            assert action is None
+            continue
+        assert action in ttt.actions(board)
+        bits = bb.from_board(board)
+        assert bb.value(bb.result(bits, action)) == bb.value(bits)
+
+
+def test_minimax_without_opening_book(monkeypatch):
+    monkeypatch.setattr(ttt, "opening_book", None)
+    board = [[X, X, EMPTY],
+             [O, O, EMPTY],
+             [EMPTY, EMPTY, EMPTY]]
+    assert ttt.book_move(board) is None
+    assert ttt.minimax(board) == (0, 2)
+    assert ttt.load_opening_book("missing.bin") is None
+
+
+def test_mnk_game_matches_tictactoe():
+    game = mnk.Game(3, 3, 3)
+    assert game.initial_state() == ttt.initial_state()
+    for board in reachable_boards():
+        assert game.player(board) == ttt.player(board)
+        assert game.actions(board) == ttt.actions(board)
+        assert game.winner(board) == ttt.winner(board)
+        assert game.terminal(board) == ttt.terminal(board)
+        for action in game.actions(board):
+            assert game.result(board, action) == ttt.result(board, action)
+
+
+def test_mnk_search_solves_tictactoe():
+    game = mnk.Game(3, 3, 3)
+    board = game.initial_state()
+    while not game.terminal(board):
+        board = game.result(board, mnk.minimax(game, board, time_limit=10))
+    assert game.winner(board) is None
+    board = [[X, X, EMPTY],
+             [O, O, EMPTY],
+             [EMPTY, EMPTY, EMPTY]]
+    assert mnk.minimax(game, board, time_limit=10) == (0, 2)
+
+
+def test_mnk_search_on_a_larger_board():
+    game = mnk.Game(6, 7, 4)
+    board = game.initial_state()
+    for action in [(5, 0), (0, 0), (5, 1), (0, 1), (5, 2)]:
+        board = game.result(board, action)
+
+    # O must block X's three in a row, and if O does not, X completes it
+    searcher = mnk.Searcher(game, time_limit=0.5)
+    assert searcher.best_move(board) == (5, 3)
+    board = game.result(board, (0, 2))
+    assert searcher.best_move(board) == (5, 3)
+
+
+def test_mnk_search_keeps_to_its_time_limit():
+    game = mnk.Game(15, 15, 5)
+    calls = []
+
+    def evaluate(game, board):
+        calls.append(board)
+        return mnk.window_evaluation(game, board)
+
+    searcher = mnk.Searcher(game, evaluate, time_limit=0.2)
+    start = time.perf_counter()
+    action = searcher.best_move(game.initial_state())
+    assert time.perf_counter() - start < 0.5
+    assert action in game.actions(game.initial_state())
+    assert calls
+
+
+def test_parallel_minimax_matches_minimax(monkeypatch):
+    boards = [ttt.initial_state()]
+    boards += [ttt.result(boards[0], action) for action in sorted(ttt.actions(boards[0]))[:3]]
+    boards.append([[X, EMPTY, EMPTY],
+                   [O, O, EMPTY],
+                   [X, EMPTY, EMPTY]])
+    for board in boards:
+        assert ttt.parallel_minimax(board, processes=2, use_book=True) == ttt.minimax(board)
+    monkeypatch.setattr(ttt, "opening_book", None)
+    for board in boards:
+        ttt.reset_transposition_table()
+        assert ttt.parallel_minimax(board, processes=2) == ttt.minimax(board)
+
+
+def test_root_pool_reused_for_a_game(monkeypatch):
+    # One pool searches every move of a game, agreeing with minimax
+    monkeypatch.setattr(ttt, "opening_book", None)
+    ttt.reset_transposition_table()
+    with ttt.RootPool(processes=2) as pool:
+        board = ttt.initial_state()
+        while not ttt.terminal(board):
+            action = ttt.parallel_minimax(board, pool=pool)
+            assert action == ttt.minimax(board)
+            board = ttt.result(board, action)
+        assert ttt.parallel_minimax(board, pool=pool) is None
+    assert ttt.winner(board) is None
+
+
+def worker_table_size(_):
+    # Number of positions in the transposition table of the worker running this
+    time.sleep(0.05)
+    return len(ttt.transposition_table)
+
+
+def test_parallel_minimax_searches_past_the_book(monkeypatch):
+    # Without use_book the pool searches even boards the book has a move for
+    board = ttt.initial_state()
+    assert ttt.book_move(board) is not None
+    calls = []
+
+    class CountingPool(ttt.RootPool):
+        def values(self, board, moves):
+            calls.append(board)
+            return super().values(board, moves)
+
+    ttt.reset_transposition_table()
+    with CountingPool(processes=2) as pool:
+        assert ttt.parallel_minimax(board, pool=pool, use_book=True) == ttt.book_move(board)
+        assert calls == []
+        action = ttt.parallel_minimax(board, pool=pool)
+        assert calls == [board]
+    monkeypatch.setattr(ttt, "opening_book", None)
+    assert action == ttt.minimax(board)
+
+
+def test_root_pool_resets_worker_tables():
+    ttt.reset_transposition_table()
+    with ttt.RootPool(processes=2) as pool:
+        ttt.parallel_minimax(ttt.initial_state(), pool=pool)
+        assert min(pool.pool.map(worker_table_size, range(2), chunksize=1)) > 0
+        pool.reset_transposition_tables()
+        assert pool.pool.map(worker_table_size, range(2), chunksize=1) == [0, 0]
+        ttt.reset_transposition_table()
+        board = ttt.initial_state()
+        while not ttt.terminal(board):
+            action = ttt.parallel_minimax(board, pool=pool)
+            board = ttt.result(board, action)
+    assert ttt.winner(board) is None
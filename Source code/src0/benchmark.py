@@ -0,0 +1,114 @@
+"""
+Benchmark maze solvers on large generated mazes
+
+Usage: python benchmark.py [size]
+
+Generates a size x size perfect maze (long corridors, one path between
+any two cells), an open room with scattered walls and the same room with
+its goal walled off, then times each solver on all three and reports
+states explored and solution length.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from maze import Maze
+
+
+def generate_corridors(size, rng):
+    """Returns the lines of a perfect maze carved by a randomized depth-first search."""
+    cells = size // 2
+    grid = [["#"] * (2 * cells + 1) for _ in range(2 * cells + 1)]
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    grid[1][1] = " "
+    while stack:
+        row, col = stack[-1]
+        unvisited = [
+            (row + d_row, col + d_col)
+            for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if 0 <= row + d_row < cells and 0 <= col + d_col < cells
+            and (row + d_row, col + d_col) not in visited
+        ]
+        if not unvisited:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(unvisited)
+        visited.add((next_row, next_col))
+        grid[row + next_row + 1][col + next_col + 1] = " "
+        grid[2 * next_row + 1][2 * next_col + 1] = " "
+        stack.append((next_row, next_col))
+    grid[1][1] = "A"
+    grid[2 * cells - 1][2 * cells - 1] = "B"
+    return ["".join(row) for row in grid]
+
+
+def generate_room(size, rng, density=0.05):
+    """Returns the lines of an open room with randomly scattered walls."""
+    grid = [["#" if rng.random() < density else " " for _ in range(size)] for _ in range(size)]
+    grid[0][0] = "A"
+    grid[size - 1][size - 1] = "B"
+    return ["".join(row) for row in grid]
+
+
+def wall_off_goal(lines):
+    """Returns the lines of a maze with walls on every side of its goal."""
+    grid = [list(line) for line in lines]
+    for i, line in enumerate(lines):
+        if "B" in line:
+            row, col = i, line.index("B")
+    for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        if 0 <= row + d_row < len(grid) and 0 <= col + d_col < len(grid[row + d_row]):
+            grid[row + d_row][col + d_col] = "#"
+    return ["".join(row) for row in grid]
+
+
+def time_solver(filename, solver):
+    """
+    Returns the seconds taken, states explored and solution length of one
+    solver, with None for the length if there is no solution.
+    """
+    maze = Maze(filename)
+    start = time.perf_counter()
+    try:
+        if solver == "jps":
+            maze.solve_jps()
+        elif solver == "wavefront":
+            maze.solve_wavefront()
+        else:
+            maze.solve(solver)
+    except Exception as e:
+        if str(e) != "no solution":
+            raise
+        return time.perf_counter() - start, maze.num_explored, None
+    return time.perf_counter() - start, maze.num_explored, len(maze.solution[0])
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [size]")
+    size = int(sys.argv[1]) if len(sys.argv) == 2 else 401
+    rng = random.Random(0)
+    room = generate_room(size, rng)
+
+    # Without a path every solver must exhaust the room before giving up
+    for label, lines in (("Corridors", generate_corridors(size, rng)),
+                         ("Open room", room),
+                         ("Walled-off goal", wall_off_goal(room))):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("\n".join(lines) + "\n")
+        try:
+            print(f"{label} ({size}x{size}):")
+            for solver in ("dfs", "bfs", "astar", "jps", "wavefront"):
+                seconds, explored, length = time_solver(f.name, solver)
+                result = f"length {length}" if length is not None else "no solution"
+                print(f"  {solver:>9}: {seconds:8.3f}s, {explored:8} explored, {result}")
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
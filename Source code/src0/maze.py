@@ -1,21 +1,35 @@
+import array
+import csv
+import functools
+import heapq
+import itertools
+import multiprocessing
+import os
 import sys
+import time
+from collections import deque
 
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = 0 if parent is None else parent.cost + 1
 
 
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+
+        # Count how many nodes in the frontier hold each state
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -24,59 +38,124 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.pop()
+            self.discard_state(node.state)
             return node
 
+    def pop(self):
+        return self.frontier.pop()
+
+    def discard_state(self, state):
+        if self.states[state] == 1:
+            del self.states[state]
+        else:
+            self.states[state] -= 1
+
 
 class QueueFrontier(StackFrontier):
 
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+    def pop(self):
+        return self.frontier.popleft()
+
+
+class PriorityFrontier(StackFrontier):
+    def __init__(self, priority):
+        super().__init__()
+        self.frontier = []
+        self.priority = priority
+
+        # Break ties between equal priorities in favour of the node furthest
+        # from the start, which is closest to the goal, then in insertion order
+        self.counter = itertools.count()
+
+    def add(self, node):
+        heapq.heappush(self.frontier, (self.priority(node), -node.cost, next(self.counter), node))
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def pop(self):
+        return heapq.heappop(self.frontier)[3]
+
+
+class CellMask():
+    """Set-like view of the cells that are True in a boolean NumPy array."""
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __contains__(self, cell):
+        return bool(self.mask[cell])
+
+    def __len__(self):
+        return int(self.mask.sum())
+
+    def __iter__(self):
+        rows, cols = self.mask.nonzero()
+        return zip(rows.tolist(), cols.tolist())
+
+
+# Actions for each (row, column) direction of movement
+DIRECTIONS = {
+    (-1, 0): "up",
+    (1, 0): "down",
+    (0, -1): "left",
+    (0, 1): "right"
+}
+
+# Strategies accepted by solve_file
+STRATEGIES = ("dfs", "bfs", "greedy", "astar", "jps", "wavefront")
+
+# Wavefronts with fewer cells than this are grown without NumPy
+NARROW_WAVEFRONT = 32
+
+# Cached jump results for jumps not yet made, and for jumps that hit a wall
+UNKNOWN_JUMP = -2
+NO_JUMP = -1
+
+# RGBA colors used when drawing mazes
+WALL_COLOR = (40, 40, 40, 255)
+START_COLOR = (255, 0, 0, 255)
+GOAL_COLOR = (0, 171, 28, 255)
+SOLUTION_COLOR = (220, 235, 113, 255)
+EXPLORED_COLOR = (212, 97, 85, 255)
+EMPTY_COLOR = (237, 240, 252, 255)
+BORDER_COLOR = (0, 0, 0, 255)
+
+# Translation from a maze file byte to 1 for a wall or 0 for open space
+WALL_BYTES = bytes(0 if chr(byte) in " AB" else 1 for byte in range(256))
+
 
 class Maze():
 
     def __init__(self, filename):
 
-        # Read file and set height and width of maze
+        # Read the file one line at a time, one byte per cell:
+        # 1 for a wall and 0 for open space, the start or the goal
+        self.walls = []
+        starts = 0
+        goals = 0
         with open(filename) as f:
-            contents = f.read()
+            for i, line in enumerate(f):
+                line = line.rstrip("\n").encode("latin-1", "replace")
+                row = bytearray(line.translate(WALL_BYTES))
+                if b"A" in line:
+                    starts += line.count(b"A")
+                    self.start = (i, line.index(b"A"))
+                if b"B" in line:
+                    goals += line.count(b"B")
+                    self.goal = (i, line.index(b"B"))
+                self.walls.append(row)
 
         # Validate start and goal
-        if contents.count("A") != 1:
+        if starts != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if goals != 1:
             raise Exception("maze must have exactly one goal")
 
-        # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+        # Determine height and width of maze, treating short lines as open
+        self.height = len(self.walls)
+        self.width = max(len(row) for row in self.walls)
+        for row in self.walls:
+            row.extend(bytes(self.width - len(row)))
 
         self.solution = None
 
@@ -102,33 +181,57 @@ class Maze():
 
     def neighbors(self, state):
         row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
+        walls = self.walls
+        if row > 0 and not walls[row - 1][col]:
+            yield ("up", (row - 1, col))
+        if row + 1 < self.height and not walls[row + 1][col]:
+            yield ("down", (row + 1, col))
+        if col > 0 and not walls[row][col - 1]:
+            yield ("left", (row, col - 1))
+        if col + 1 < self.width and not walls[row][col + 1]:
+            yield ("right", (row, col + 1))
+
+
+    def distance_to_goal(self, node):
+        """Returns the Manhattan distance from a node's cell to the goal."""
+        return abs(node.state[0] - self.goal[0]) + abs(node.state[1] - self.goal[1])
+
+    def make_frontier(self, strategy):
+        """Returns an empty frontier for a search strategy."""
+        if strategy == "dfs":
+            return StackFrontier()
+        elif strategy == "bfs":
+            return QueueFrontier()
+        elif strategy == "greedy":
+            return PriorityFrontier(self.distance_to_goal)
+        elif strategy == "astar":
+            return PriorityFrontier(lambda node: node.cost + self.distance_to_goal(node))
+        else:
+            raise ValueError(f"unknown strategy: {strategy}")
 
+    def solve(self, strategy="dfs"):
+        """
+        Finds a solution to maze, if one exists.
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+        The strategy is "dfs" (depth-first), "bfs" (breadth-first),
+        "greedy" (greedy best-first) or "astar" (A* search), the last
+        two ordered by Manhattan distance to the goal.
+        """
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
         start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
+        frontier = self.make_frontier(strategy)
         frontier.add(start)
 
-        # Initialize an empty explored set
+        # A* keeps the cheapest cost found to every cell in the frontier
+        costs = {self.start: 0}
+
+        # Initialize an empty explored set, remembering the order cells were explored
         self.explored = set()
+        self.explored_order = []
 
         # Keep looping until solution found
         while True:
@@ -137,8 +240,10 @@ class Maze():
             if frontier.empty():
                 raise Exception("no solution")
 
-            # Choose a node from the frontier
+            # Choose a node from the frontier, skipping cells reached again more cheaply
             node = frontier.remove()
+            if node.state in self.explored:
+                continue
             self.num_explored += 1
 
             # If node is the goal, then we have a solution
@@ -156,74 +261,427 @@ class Maze():
 
             # Mark node as explored
             self.explored.add(node.state)
+            self.explored_order.append(node.state)
 
             # Add neighbors to frontier
             for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
+                if state in self.explored:
+                    continue
+                if strategy == "astar":
+                    if node.cost + 1 < costs.get(state, float("inf")):
+                        costs[state] = node.cost + 1
+                        frontier.add(Node(state=state, parent=node, action=action))
+                elif not frontier.contains_state(state):
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
 
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
+    def solve_wavefront(self):
+        """Finds a shortest solution with NumPy, growing the whole BFS wavefront at once."""
+        import numpy as np
+
+        # Pad the grid with walls so every cell has four neighbours at fixed
+        # offsets in the flattened array, and no step can leave the grid.
+        # Open cells are one byte each, shared between a bytearray and a
+        # NumPy view of the same memory
+        width = self.width + 2
+        walls = np.frombuffer(b"".join(self.walls), dtype=np.uint8).reshape(self.height, self.width)
+        open_cells = bytearray((self.height + 2) * width)
+        open_array = np.frombuffer(open_cells, dtype=bool)
+        open_array.reshape(self.height + 2, width)[1:-1, 1:-1] = walls == 0
+        offsets = (-width, width, -1, 1)
+
+        # Distance from the start to every reached cell, -1 if not reached,
+        # shared between a Python array and a NumPy view of the same memory
+        distances = array.array("i", [-1]) * len(open_cells)
+        distance_array = np.frombuffer(distances, dtype=np.int32)
+        start = (self.start[0] + 1) * width + self.start[1] + 1
+        goal = (self.goal[0] + 1) * width + self.goal[1] + 1
+        distances[start] = 0
+
+        # Only the cells reached last can reach new ones, so each step
+        # costs time in proportion to the size of the wavefront
+        wavefront = [start]
+        distance = 0
+        while distances[goal] < 0:
+            distance += 1
+
+            # Narrow wavefronts, as in corridors, are cheaper to grow one cell at a time
+            if len(wavefront) < NARROW_WAVEFRONT:
+                neighbors = []
+                for cell in wavefront:
+                    for offset in offsets:
+                        neighbor = cell + offset
+                        if open_cells[neighbor] and distances[neighbor] < 0:
+                            distances[neighbor] = distance
+                            neighbors.append(neighbor)
+            else:
+                neighbors = (np.asarray(wavefront)[:, None] + offsets).ravel()
+                neighbors = np.unique(neighbors[open_array[neighbors] & (distance_array[neighbors] < 0)])
+                distance_array[neighbors] = distance
+                if len(neighbors) < NARROW_WAVEFRONT:
+                    neighbors = neighbors.tolist()
+
+            # If the wavefront cannot grow, then no path
+            if len(neighbors) == 0:
+                self.num_explored = int(np.count_nonzero(distance_array >= 0))
+                raise Exception("no solution")
+            wavefront = neighbors
+        distances = distance_array.reshape(self.height + 2, width)[1:-1, 1:-1].copy()
+
+        # Walk back from the goal, always stepping to a cell one closer to the start
+        actions = []
+        cells = []
+        row, col = self.goal
+        while (row, col) != self.start:
+            actions_and_cells = (
+                ("down", (row - 1, col)),
+                ("up", (row + 1, col)),
+                ("right", (row, col - 1)),
+                ("left", (row, col + 1))
+            )
+            for action, (r, c) in actions_and_cells:
+                if 0 <= r < self.height and 0 <= c < self.width and distances[r, c] == distances[row, col] - 1:
+                    actions.append(action)
+                    cells.append((row, col))
+                    row, col = r, c
+                    break
+        actions.reverse()
+        cells.reverse()
+
+        self.distances = distances
+        self.explored = CellMask(distances >= 0)
+        self.num_explored = len(self.explored)
+        self.solution = (actions, cells)
+
+
+    def is_open(self, row, col):
+        """Returns True if the cell is inside the maze and not a wall."""
+        return 0 <= row < self.height and 0 <= col < self.width and not self.walls[row][col]
+
+    def jump(self, row, col, d_row, d_col):
+        """
+        Moves from a cell in a straight line and returns the first jump point
+        reached, or None if a wall or the edge is hit first.
+
+        Horizontal moves stop at the goal or where a wall above or below
+        ends. Vertical moves also stop wherever a horizontal jump would
+        find a jump point.
+        """
+
+        # Every cell passed on the way jumps to the same point, so each row
+        # (or column) keeps the results of its cells by position along it
+        if d_row == 0:
+            lines, line, position, step, length = self.jumps[(0, d_col)], row, col, d_col, self.width
+        else:
+            lines, line, position, step, length = self.jumps[(d_row, 0)], col, row, d_row, self.height
+        known = lines[line]
+        if known is None:
+            known = lines[line] = array.array("i", [UNKNOWN_JUMP]) * length
+        first = position
+        result = known[position]
+
+        # Walk the grid padded with walls, so no step can leave it
+        walls = self.padded_walls
+        width = self.width + 2
+        cell = (row + 1) * width + col + 1
+        offset = d_row * width + d_col
+        goal = (self.goal[0] + 1) * width + self.goal[1] + 1
+
+        while result == UNKNOWN_JUMP:
+            cell += offset
+            position += step
+            if walls[cell]:
+                result = NO_JUMP
+            elif cell == goal:
+                result = position
+            elif d_row == 0:
+                behind = cell - d_col
+                if (not walls[cell - width] and walls[behind - width]) or (not walls[cell + width] and walls[behind + width]):
+                    result = position
+            else:
+                behind = cell - offset
+                if ((not walls[cell - 1] and walls[behind - 1]) or (not walls[cell + 1] and walls[behind + 1])
+                        or self.jump(position, line, 0, -1) is not None or self.jump(position, line, 0, 1) is not None):
+                    result = position
+            if result == UNKNOWN_JUMP:
+                result = known[position]
+
+        for passed in range(first, position, step):
+            known[passed] = result
+        if result == NO_JUMP:
+            return None
+        return (line, result) if d_row == 0 else (result, line)
+
+    def jump_directions(self, row, col, direction):
+        """Returns the directions to search from a jump point reached moving in direction."""
+        if direction is None:
+            return list(DIRECTIONS)
+        d_row, d_col = direction
+        if d_row == 0:
+
+            # Keep going, and turn only where a wall beside the row has ended
+            directions = [direction]
+            for side in (-1, 1):
+                if self.is_open(row + side, col) and not self.is_open(row + side, col - d_col):
+                    directions.append((side, 0))
+            return directions
+
+        # Vertical moves may continue or turn either way
+        return [direction, (0, -1), (0, 1)]
+
+    def solve_jps(self):
+        """Finds a shortest solution with Jump Point Search over the 4-connected grid."""
+
+        # Keep track of number of jump points explored
+        self.num_explored = 0
+        self.explored = set()
+        self.explored_order = []
+
+        # Walls with a border of walls around them, one byte per cell in one array
+        width = self.width + 2
+        self.padded_walls = bytearray(b"\1" * width)
+        for row in self.walls:
+            self.padded_walls += b"\1" + row + b"\1"
+        self.padded_walls += b"\1" * width
+
+        # Jump results in each direction, for rows or columns as they are reached
+        self.jumps = {
+            direction: [None] * (self.height if direction[0] == 0 else self.width)
+            for direction in DIRECTIONS
+        }
+
+        # Search states are (cell, direction moved to reach it), ordered by A*
+        # with ties going to the state furthest from the start
+        start = (self.start, None)
+        counter = itertools.count()
+        goal_row, goal_col = self.goal
+        estimate = abs(self.start[0] - goal_row) + abs(self.start[1] - goal_col)
+        frontier = [(estimate, 0, next(counter), start)]
+        parents = {start: None}
+        costs = {start: 0}
+        expanded = set()
+
+        # Lowest cost of any state expanded at each cell. No shortest path
+        # passes a cell at a higher cost, so such states are never expanded
+        cell_costs = {}
+
+        while frontier:
+            _, cost, _, state = heapq.heappop(frontier)
+            cost = -cost
+            if state in expanded:
+                continue
+            (row, col), direction = state
+            if cost > cell_costs.get((row, col), cost):
+                continue
+            expanded.add(state)
+            cell_costs[(row, col)] = cost
+            self.num_explored += 1
+            if (row, col) not in self.explored:
+                self.explored.add((row, col))
+                self.explored_order.append((row, col))
 
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
+            # If the goal is reached, walk every jump back one cell at a time
+            if (row, col) == self.goal:
+                actions = []
+                cells = []
+                while parents[state] is not None:
+                    (r, c), (d_row, d_col) = state
+                    parent = parents[state]
+                    while (r, c) != parent[0]:
+                        actions.append(DIRECTIONS[(d_row, d_col)])
+                        cells.append((r, c))
+                        r, c = r - d_row, c - d_col
+                    state = parent
+                actions.reverse()
+                cells.reverse()
+                self.solution = (actions, cells)
+                return
 
+            for d_row, d_col in self.jump_directions(row, col, direction):
+                point = self.jump(row, col, d_row, d_col)
+                if point is None:
+                    continue
+                child = (point, (d_row, d_col))
+                child_cost = cost + abs(point[0] - row) + abs(point[1] - col)
+                if child_cost > cell_costs.get(point, child_cost):
+                    continue
+                if child not in costs or child_cost < costs[child]:
+                    costs[child] = child_cost
+                    parents[child] = state
+                    priority = child_cost + abs(point[0] - goal_row) + abs(point[1] - goal_col)
+                    heapq.heappush(frontier, (priority, -child_cost, next(counter), child))
+
+        raise Exception("no solution")
+
+
+    def cell_colors(self, show_solution=True, show_explored=False):
+        """Returns a height x width x 4 NumPy array with the RGBA color of every cell."""
+        import numpy as np
+
+        walls = np.frombuffer(b"".join(self.walls), dtype=np.uint8).reshape(self.height, self.width)
+        colors = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        colors[...] = EMPTY_COLOR
+
+        # Paint from the lowest precedence up so later masks win
+        if self.solution is not None and show_explored:
+            colors[self.cell_mask(self.explored)] = EXPLORED_COLOR
+        if self.solution is not None and show_solution:
+            colors[self.cell_mask(self.solution[1])] = SOLUTION_COLOR
+        colors[self.goal] = GOAL_COLOR
+        colors[self.start] = START_COLOR
+        colors[walls != 0] = WALL_COLOR
+        return colors
+
+    def cell_mask(self, cells):
+        """Returns a boolean NumPy array that is True for the given cells."""
+        import numpy as np
+
+        if isinstance(cells, CellMask):
+            return cells.mask
+        mask = np.zeros((self.height, self.width), dtype=bool)
+        if len(cells) > 0:
+            rows, cols = zip(*cells)
+            mask[list(rows), list(cols)] = True
+        return mask
+
+    def cell_pixels(self, cell_size, cell_border):
+        """Returns a boolean NumPy array of the pixels filled inside one cell."""
+        import numpy as np
+
+        cell_border = min(cell_border, (cell_size - 1) // 2)
+        filled = np.zeros(cell_size, dtype=bool)
+        filled[cell_border:cell_size - cell_border + 1] = True
+        return filled[:, None] & filled[None, :]
+
+    def render(self, colors, cell_size, cell_border):
+        """Scales a grid of cell colors into an image array, with a black border around each cell."""
+        import numpy as np
+
+        pixels = np.repeat(np.repeat(colors, cell_size, axis=0), cell_size, axis=1)
+        filled = np.tile(self.cell_pixels(cell_size, cell_border), (self.height, self.width))
+        pixels[~filled] = BORDER_COLOR
+        return pixels
+
+    def output_image(self, filename, show_solution=True, show_explored=False, cell_size=50, cell_border=2):
+        from PIL import Image
+
+        colors = self.cell_colors(show_solution, show_explored)
+        img = Image.fromarray(self.render(colors, cell_size, cell_border), "RGBA")
         img.save(filename)
 
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+    def exploration_order(self):
+        """Returns the explored cells in the order they were explored."""
+        import numpy as np
+
+        if isinstance(self.explored, CellMask):
+            distances = self.distances.ravel()
+            reached = np.flatnonzero(distances >= 0)
+            reached = reached[np.argsort(distances[reached], kind="stable")]
+            return [divmod(index, self.width) for index in reached.tolist()]
+        return self.explored_order
+
+    def output_frames(self, prefix, cells_per_frame=100, cell_size=50, cell_border=2):
+        """
+        Saves images of the exploration as it progresses, numbered from prefix00000.png,
+        ending with a frame that shows the solution. Returns the filenames written.
+
+        Each frame only repaints the cells explored since the previous one.
+        """
+        from PIL import Image
+
+        filled = self.cell_pixels(cell_size, cell_border)
+        pixels = self.render(self.cell_colors(show_solution=False), cell_size, cell_border)
+
+        def paint(cells, color):
+            for row, col in cells:
+                if (row, col) != self.start and (row, col) != self.goal:
+                    block = pixels[row * cell_size:(row + 1) * cell_size, col * cell_size:(col + 1) * cell_size]
+                    block[filled] = color
+
+        def save():
+            filename = f"{prefix}{len(filenames):05}.png"
+            Image.fromarray(pixels, "RGBA").save(filename)
+            filenames.append(filename)
+
+        filenames = []
+        order = self.exploration_order()
+        for i in range(0, len(order), cells_per_frame):
+            paint(order[i:i + cells_per_frame], EXPLORED_COLOR)
+            save()
+        if self.solution is not None:
+            paint(self.solution[1], SOLUTION_COLOR)
+            save()
+        return filenames
+
+
+def solve_file(filename, strategy="dfs"):
+    """
+    Solves one maze file and returns a row of (file, path length,
+    states explored, seconds taken, error), leaving the path length
+    empty if the maze has no solution.
+    """
+    start = time.perf_counter()
+    m = None
+    try:
+        m = Maze(filename)
+        if strategy == "jps":
+            m.solve_jps()
+        elif strategy == "wavefront":
+            m.solve_wavefront()
+        else:
+            m.solve(strategy)
+    except Exception as e:
+        explored = getattr(m, "num_explored", "")
+        return (filename, "", explored, time.perf_counter() - start, str(e))
+    return (filename, len(m.solution[0]), m.num_explored, time.perf_counter() - start, "")
+
+
+def solve_directory(directory, output, strategy="dfs", processes=None):
+    """
+    Solves every .txt maze file in a directory on a pool of processes,
+    writing one CSV row per file, in filename order, to output.
+    Returns the number of mazes solved and the number that failed.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy: {strategy}")
+    filenames = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".txt")
+    )
+    with multiprocessing.Pool(processes) as pool, open(output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file", "path_length", "num_explored", "seconds", "error"])
+        rows = pool.imap(functools.partial(solve_file, strategy=strategy), filenames, chunksize=16)
+        solved = 0
+        for row in rows:
+            writer.writerow(row)
+            if not row[4]:
+                solved += 1
+    return solved, len(filenames) - solved
+
+
+def main():
+    if len(sys.argv) in (4, 5) and sys.argv[1] == "--batch":
+        strategy = sys.argv[4] if len(sys.argv) == 5 else "dfs"
+        if strategy not in STRATEGIES:
+            sys.exit(f"Unknown strategy: {strategy} (expected one of {', '.join(STRATEGIES)})")
+        solved, failed = solve_directory(sys.argv[2], sys.argv[3], strategy)
+        print(f"Solved {solved} mazes, {failed} failed.")
+        return
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python maze.py maze.txt\n"
+                 "       python maze.py --batch directory results.csv [strategy]")
+
+    m = Maze(sys.argv[1])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve()
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
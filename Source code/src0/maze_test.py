@@ -0,0 +1,249 @@
+"""
+Tests for maze.py
+
+Make sure that this file is in the same directory as maze.py!
+"""
+import csv
+import math
+import random
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from benchmark import generate_corridors, generate_room, wall_off_goal
+from maze import DIRECTIONS, EXPLORED_COLOR, CellMask, Maze, solve_directory, solve_file
+
+# Strategies that must find a shortest path
+SHORTEST = ("bfs", "astar", "jps", "wavefront")
+
+# Row and column steps for every action
+STEPS = {action: step for step, action in DIRECTIONS.items()}
+
+
+def write_maze(path, lines):
+    # Write the lines of a maze to a file and return its name
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def solve(filename, strategy):
+    # Solve a maze file with any strategy and return the maze
+    maze = Maze(filename)
+    if strategy == "jps":
+        maze.solve_jps()
+    elif strategy == "wavefront":
+        maze.solve_wavefront()
+    else:
+        maze.solve(strategy)
+    return maze
+
+
+def check_solution(maze):
+    # Every action must step onto the next open cell, ending at the goal
+    actions, cells = maze.solution
+    assert len(actions) == len(cells)
+    row, col = maze.start
+    for action, cell in zip(actions, cells):
+        d_row, d_col = STEPS[action]
+        row, col = row + d_row, col + d_col
+        assert (row, col) == cell
+        assert 0 <= row < maze.height and 0 <= col < maze.width
+        assert not maze.walls[row][col]
+    assert (row, col) == maze.goal
+    return len(actions)
+
+
+def test_example_mazes_solved_by_every_strategy():
+    for filename in ("maze1.txt", "maze2.txt", "maze3.txt"):
+        shortest = check_solution(solve(filename, "bfs"))
+        for strategy in SHORTEST:
+            assert check_solution(solve(filename, strategy)) == shortest
+        for strategy in ("dfs", "greedy"):
+            assert check_solution(solve(filename, strategy)) >= shortest
+
+
+def test_shortest_strategies_match_bfs_on_generated_mazes(tmp_path):
+    rng = random.Random(0)
+    mazes = [generate_corridors(41, rng), generate_room(41, rng, density=0.3)]
+    for seed in range(20):
+        rng = random.Random(seed)
+        height, width = rng.randint(2, 25), rng.randint(2, 25)
+        grid = [["#" if rng.random() < 0.3 else " " for _ in range(width)] for _ in range(height)]
+        (start_row, start_col), (goal_row, goal_col) = rng.sample(
+            [(i, j) for i in range(height) for j in range(width)], 2
+        )
+        grid[start_row][start_col] = "A"
+        grid[goal_row][goal_col] = "B"
+        mazes.append(["".join(row) for row in grid])
+
+    for i, lines in enumerate(mazes):
+        filename = write_maze(tmp_path / f"maze{i}.txt", lines)
+        try:
+            shortest = check_solution(solve(filename, "bfs"))
+        except Exception as e:
+            assert str(e) == "no solution"
+            for strategy in SHORTEST:
+                with pytest.raises(Exception, match="no solution"):
+                    solve(filename, strategy)
+            continue
+        for strategy in SHORTEST:
+            assert check_solution(solve(filename, strategy)) == shortest
+
+
+def test_astar_explores_less_than_bfs_in_open_room(tmp_path):
+    filename = write_maze(tmp_path / "room.txt", generate_room(61, random.Random(0)))
+    bfs = solve(filename, "bfs")
+    astar = solve(filename, "astar")
+    assert len(astar.solution[0]) == len(bfs.solution[0])
+    assert astar.num_explored < bfs.num_explored // 4
+
+
+def test_jps_explores_less_than_bfs_without_a_path(tmp_path):
+    filename = write_maze(tmp_path / "walled.txt", wall_off_goal(generate_room(61, random.Random(0))))
+    states = {}
+    for strategy in ("bfs", "jps"):
+        maze = Maze(filename)
+        with pytest.raises(Exception, match="no solution"):
+            maze.solve_jps() if strategy == "jps" else maze.solve(strategy)
+        states[strategy] = maze.num_explored
+    assert states["jps"] < states["bfs"]
+
+
+def test_short_lines_padded_as_open(tmp_path):
+    filename = write_maze(tmp_path / "ragged.txt", ["A", "#####", "B"])
+    maze = Maze(filename)
+    assert maze.width == 5
+    assert all(len(row) == 5 for row in maze.walls)
+    assert list(maze.walls[0]) == [0, 0, 0, 0, 0]
+    with pytest.raises(Exception, match="no solution"):
+        maze.solve("bfs")
+
+    filename = write_maze(tmp_path / "around.txt", ["A", "#### ", "B"])
+    for strategy in SHORTEST:
+        assert check_solution(solve(filename, strategy)) == 10
+
+
+def test_start_and_goal_validated(tmp_path):
+    with pytest.raises(Exception, match="exactly one start point"):
+        Maze(write_maze(tmp_path / "two_starts.txt", ["A A", " B "]))
+    with pytest.raises(Exception, match="exactly one start point"):
+        Maze(write_maze(tmp_path / "no_start.txt", ["  ", " B"]))
+    with pytest.raises(Exception, match="exactly one goal"):
+        Maze(write_maze(tmp_path / "no_goal.txt", ["A ", "  "]))
+    with pytest.raises(Exception, match="exactly one goal"):
+        Maze(write_maze(tmp_path / "two_goals.txt", ["AB", "B "]))
+
+
+def test_unknown_strategy_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Maze("maze1.txt").solve("bogus")
+    with pytest.raises(ValueError):
+        solve_directory(str(tmp_path), str(tmp_path / "results.csv"), "bogus")
+    assert not (tmp_path / "results.csv").exists()
+
+
+def test_solve_file_rows(tmp_path):
+    filename, length, explored, seconds, error = solve_file("maze1.txt", "bfs")
+    assert (filename, error) == ("maze1.txt", "")
+    assert length == len(solve("maze1.txt", "bfs").solution[0])
+    assert explored >= length and seconds >= 0
+
+    blocked = write_maze(tmp_path / "blocked.txt", ["A#", "#B"])
+    _, length, explored, _, error = solve_file(blocked, "astar")
+    assert (length, explored, error) == ("", 1, "no solution")
+
+    invalid = write_maze(tmp_path / "invalid.txt", ["  ", " B"])
+    _, length, explored, _, error = solve_file(invalid, "jps")
+    assert (length, explored) == ("", "")
+    assert error == "maze must have exactly one start point"
+
+
+def test_solve_directory_counts_failures(tmp_path):
+    mazes = tmp_path / "mazes"
+    mazes.mkdir()
+    write_maze(mazes / "a.txt", ["A  B"])
+    write_maze(mazes / "b.txt", ["A#B"])
+    write_maze(mazes / "c.txt", ["A  "])
+    write_maze(mazes / "notes.md", ["not a maze"])
+    output = tmp_path / "results.csv"
+
+    assert solve_directory(str(mazes), str(output), "wavefront", processes=2) == (1, 2)
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["file"] for row in rows] == [str(mazes / name) for name in ("a.txt", "b.txt", "c.txt")]
+    assert [row["path_length"] for row in rows] == ["3", "", ""]
+    assert [row["error"] for row in rows] == ["", "no solution", "maze must have exactly one goal"]
+
+
+def draw_reference(maze, filename, show_solution=True, show_explored=False):
+    # The image output_image drew cell by cell with ImageDraw before it used NumPy
+    cell_size = 50
+    cell_border = 2
+    img = Image.new("RGBA", (maze.width * cell_size, maze.height * cell_size), "black")
+    draw = ImageDraw.Draw(img)
+    solution = maze.solution[1] if maze.solution is not None else None
+    for i, row in enumerate(maze.walls):
+        for j, col in enumerate(row):
+            if col:
+                fill = (40, 40, 40)
+            elif (i, j) == maze.start:
+                fill = (255, 0, 0)
+            elif (i, j) == maze.goal:
+                fill = (0, 171, 28)
+            elif solution is not None and show_solution and (i, j) in solution:
+                fill = (220, 235, 113)
+            elif solution is not None and show_explored and (i, j) in maze.explored:
+                fill = (212, 97, 85)
+            else:
+                fill = (237, 240, 252)
+            draw.rectangle(
+                ([(j * cell_size + cell_border, i * cell_size + cell_border),
+                  ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
+                fill=fill
+            )
+    img.save(filename)
+
+
+def pixels(filename):
+    # Read an image file into an array of RGBA pixels
+    with Image.open(filename) as img:
+        return np.array(img.convert("RGBA"))
+
+
+def test_images_match_reference_renderer(tmp_path):
+    for filename in ("maze1.txt", "maze2.txt", "maze3.txt"):
+        unsolved = Maze(filename)
+        unsolved.output_image(tmp_path / "image.png")
+        draw_reference(unsolved, tmp_path / "reference.png")
+        assert np.array_equal(pixels(tmp_path / "image.png"), pixels(tmp_path / "reference.png"))
+
+        for strategy in ("bfs", "wavefront"):
+            maze = solve(filename, strategy)
+            for show_solution in (True, False):
+                for show_explored in (True, False):
+                    maze.output_image(tmp_path / "image.png", show_solution, show_explored)
+                    draw_reference(maze, tmp_path / "reference.png", show_solution, show_explored)
+                    assert np.array_equal(pixels(tmp_path / "image.png"), pixels(tmp_path / "reference.png"))
+
+
+def test_frames_end_with_the_solution_image(tmp_path):
+    for strategy in ("bfs", "wavefront"):
+        maze = solve("maze2.txt", strategy)
+        order = maze.exploration_order()
+        assert order[0] == maze.start
+        assert sorted(order) == sorted(maze.explored)
+        if isinstance(maze.explored, CellMask):
+            assert [maze.distances[cell] for cell in order] == sorted(maze.distances[cell] for cell in order)
+
+        prefix = str(tmp_path / f"{strategy}_")
+        filenames = maze.output_frames(prefix, cells_per_frame=7, cell_size=10, cell_border=1)
+        assert len(filenames) == math.ceil(len(order) / 7) + 1
+        assert filenames[0] == prefix + "00000.png"
+
+        # Every frame paints over the one before, ending with the full image
+        maze.output_image(tmp_path / "image.png", show_explored=True, cell_size=10, cell_border=1)
+        assert np.array_equal(pixels(filenames[-1]), pixels(tmp_path / "image.png"))
+        explored = [int((pixels(name) == EXPLORED_COLOR).all(axis=2).sum()) for name in filenames[:-1]]
+        assert explored == sorted(explored) and explored[0] > 0
+